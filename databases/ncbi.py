@@ -6,19 +6,55 @@ all major NCBI databases (PubMed, Gene, Nucleotide, Protein, etc.).
 """
 
 import json
-import time
 import urllib.parse
 import urllib.request
 from dataclasses import dataclass
 
+from .rate_limit import SlidingWindowLimiter
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
 
 BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+USER_AGENT = "BioAgent/1.0 (Bioinformatics Agent)"
+
+# Response cache: key version (bump to invalidate) and lifetime. Search hits
+# change as NCBI indexes new records, so entries only live for a day.
+CACHE_VERSION = "v1"
+CACHE_TTL = 24 * 3600
+# Request parameters that identify the caller rather than the query
+_UNCACHED_PARAMS = ("api_key", "email")
+
+
+def _loads(text: str):
+    """Parse a JSON response body (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _dumps_indented(obj) -> str:
+    """Pretty-print a JSON value with 2-space indentation."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2)
 
 # NCBI requests max 3 requests/second without API key, 10 with
-_last_request_time = 0.0
+RATE_LIMIT = 3
+RATE_LIMIT_WITH_KEY = 10
 
 
-@dataclass
+@dataclass(slots=True)
 class NCBIResult:
     """Result from an NCBI query."""
     data: str
@@ -38,15 +74,50 @@ class NCBIResult:
 class NCBIClient:
     """Client for NCBI E-utilities."""
 
-    def __init__(self, api_key: str | None = None, email: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        email: str | None = None,
+        cache_dir: str | None = None,
+    ):
         """
         Args:
             api_key: NCBI API key (get one at https://www.ncbi.nlm.nih.gov/account/settings/)
                      Increases rate limit from 3 to 10 requests/second.
             email: Email address (required by NCBI for identification).
+            cache_dir: Directory for an on-disk response cache (requires diskcache).
         """
         self.api_key = api_key
         self.email = email
+        self._session = None
+        self._limiter = SlidingWindowLimiter(RATE_LIMIT_WITH_KEY if api_key else RATE_LIMIT)
+        self._cache = None
+        if cache_dir and DISKCACHE_AVAILABLE:
+            self._cache = diskcache.Cache(cache_dir)
+
+    def _get_session(self):
+        """Return a pooled requests.Session, or None when requests is missing."""
+        if self._session is None:
+            try:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+            except ImportError:
+                return None
+
+            session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            adapter = HTTPAdapter(
+                pool_connections=8,
+                pool_maxsize=16,
+                max_retries=Retry(
+                    total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504]
+                ),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
 
     def query(
         self,
@@ -55,6 +126,7 @@ class NCBIClient:
         query: str,
         max_results: int = 10,
         return_type: str = "json",
+        no_cache: bool = False,
     ) -> NCBIResult:
         """
         Execute an NCBI E-utilities query.
@@ -65,20 +137,20 @@ class NCBIClient:
             query: Search term or comma-separated IDs
             max_results: Maximum results to return
             return_type: Return format (json, xml, fasta, gb, abstract)
+            no_cache: Bypass the response cache and always query NCBI
 
         Returns:
             NCBIResult with the response data
         """
-        self._rate_limit()
-
+        use_cache = not no_cache
         if operation == "esearch":
-            return self._esearch(database, query, max_results, return_type)
+            return self._esearch(database, query, max_results, return_type, use_cache)
         elif operation == "efetch":
-            return self._efetch(database, query, return_type)
+            return self._efetch(database, query, return_type, use_cache)
         elif operation == "esummary":
-            return self._esummary(database, query, max_results)
+            return self._esummary(database, query, max_results, use_cache)
         elif operation == "einfo":
-            return self._einfo(database)
+            return self._einfo(database, use_cache)
         else:
             return NCBIResult(
                 data=f"Unknown operation: {operation}. Use esearch, efetch, esummary, or einfo.",
@@ -88,7 +160,12 @@ class NCBIClient:
             )
 
     def _esearch(
-        self, database: str, query: str, max_results: int, return_type: str
+        self,
+        database: str,
+        query: str,
+        max_results: int,
+        return_type: str,
+        use_cache: bool = True,
     ) -> NCBIResult:
         """Search an NCBI database."""
         params = {
@@ -98,17 +175,31 @@ class NCBIClient:
             "retmode": "json",
             "usehistory": "y",
         }
-        response = self._request("esearch.fcgi", params)
+        # A cached search carries a WebEnv that may have expired server-side
+        cached_search = (
+            use_cache
+            and self._cache is not None
+            and self._cache_key("esearch.fcgi", params) in self._cache
+        )
+        response = self._request("esearch.fcgi", params, use_cache)
 
         try:
-            data = json.loads(response)
+            data = _loads(response)
             result = data.get("esearchresult", {})
             count = int(result.get("count", 0))
             id_list = result.get("idlist", [])
 
+            # Follow-up requests reference the search on NCBI's history
+            # server instead of re-sending the ID list
+            history = None
+            if not cached_search and result.get("webenv") and result.get("querykey"):
+                history = (result["webenv"], result["querykey"])
+
             # If we got IDs, fetch summaries for convenience
             if id_list and database != "pubmed":
-                summary = self._esummary(database, ",".join(id_list), max_results)
+                summary = self._esummary(
+                    database, ",".join(id_list), max_results, use_cache, history
+                )
                 return NCBIResult(
                     data=f"Found {count} results. Top {len(id_list)} IDs: {', '.join(id_list)}\n\nSummaries:\n{summary.data}",
                     query=query,
@@ -118,7 +209,9 @@ class NCBIClient:
                 )
             elif id_list and database == "pubmed":
                 # For PubMed, fetch abstracts
-                abstract_result = self._efetch(database, ",".join(id_list[:5]), "abstract")
+                abstract_result = self._efetch(
+                    database, ",".join(id_list[:5]), "abstract", use_cache, history
+                )
                 return NCBIResult(
                     data=f"Found {count} results. Top {len(id_list)} IDs: {', '.join(id_list)}\n\nAbstracts:\n{abstract_result.data}",
                     query=query,
@@ -142,8 +235,15 @@ class NCBIClient:
                 operation="esearch",
             )
 
-    def _efetch(self, database: str, ids: str, return_type: str) -> NCBIResult:
-        """Fetch records by ID."""
+    def _efetch(
+        self,
+        database: str,
+        ids: str,
+        return_type: str,
+        use_cache: bool = True,
+        history: tuple[str, str] | None = None,
+    ) -> NCBIResult:
+        """Fetch records by ID, or by (WebEnv, query_key) from a prior esearch."""
         rettype_map = {
             "abstract": ("abstract", "text"),
             "fasta": ("fasta", "text"),
@@ -159,7 +259,9 @@ class NCBIClient:
             "rettype": rettype,
             "retmode": retmode,
         }
-        response = self._request("efetch.fcgi", params)
+        response = self._request(
+            "efetch.fcgi", self._history_params(params, history), use_cache, params
+        )
 
         return NCBIResult(
             data=response[:20000],  # Truncate very long responses
@@ -168,24 +270,33 @@ class NCBIClient:
             operation="efetch",
         )
 
-    def _esummary(self, database: str, ids: str, max_results: int = 10) -> NCBIResult:
-        """Get document summaries."""
+    def _esummary(
+        self,
+        database: str,
+        ids: str,
+        max_results: int = 10,
+        use_cache: bool = True,
+        history: tuple[str, str] | None = None,
+    ) -> NCBIResult:
+        """Get document summaries, by ID or from a prior esearch's history."""
         params = {
             "db": database,
             "id": ids,
             "retmode": "json",
         }
-        response = self._request("esummary.fcgi", params)
+        response = self._request(
+            "esummary.fcgi", self._history_params(params, history), use_cache, params
+        )
 
         try:
-            data = json.loads(response)
+            data = _loads(response)
             result = data.get("result", {})
             # Format summaries nicely
             uids = result.get("uids", [])
             summaries = []
             for uid in uids[:max_results]:
                 entry = result.get(uid, {})
-                summaries.append(json.dumps(entry, indent=2))
+                summaries.append(_dumps_indented(entry))
             formatted = "\n---\n".join(summaries) if summaries else response[:5000]
         except (json.JSONDecodeError, KeyError):
             formatted = response[:5000]
@@ -197,10 +308,10 @@ class NCBIClient:
             operation="esummary",
         )
 
-    def _einfo(self, database: str) -> NCBIResult:
+    def _einfo(self, database: str, use_cache: bool = True) -> NCBIResult:
         """Get database information."""
         params = {"db": database, "retmode": "json"}
-        response = self._request("einfo.fcgi", params)
+        response = self._request("einfo.fcgi", params, use_cache)
 
         return NCBIResult(
             data=response[:10000],
@@ -209,8 +320,60 @@ class NCBIClient:
             operation="einfo",
         )
 
-    def _request(self, endpoint: str, params: dict) -> str:
-        """Make an HTTP request to NCBI."""
+    @staticmethod
+    def _history_params(params: dict, history: tuple[str, str] | None) -> dict:
+        """Swap an explicit ID list for a WebEnv/query_key reference."""
+        if history is None:
+            return params
+        webenv, query_key = history
+        fetch_params = {k: v for k, v in params.items() if k != "id"}
+        fetch_params.update(
+            WebEnv=webenv,
+            query_key=query_key,
+            retstart=0,
+            retmax=params["id"].count(",") + 1,
+        )
+        return fetch_params
+
+    @staticmethod
+    def _cache_key(endpoint: str, params: dict) -> tuple:
+        """Cache key for a request, ignoring caller-identifying parameters."""
+        return (
+            CACHE_VERSION,
+            endpoint,
+            tuple(sorted(
+                (k, str(v)) for k, v in params.items() if k not in _UNCACHED_PARAMS
+            )),
+        )
+
+    def _request(
+        self,
+        endpoint: str,
+        params: dict,
+        use_cache: bool = True,
+        cache_params: dict | None = None,
+    ) -> str:
+        """Make an HTTP request to NCBI, served from the cache when possible.
+
+        `cache_params` keys the cache when `params` holds per-session values
+        (a WebEnv), so history requests share entries with ID requests.
+        """
+        cache_key = None
+        if self._cache is not None and use_cache:
+            cache_key = self._cache_key(endpoint, cache_params or params)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        body = self._fetch(endpoint, params)
+        if cache_key is not None and not body.startswith("Error querying NCBI"):
+            self._cache.set(cache_key, body, expire=CACHE_TTL)
+        return body
+
+    def _fetch(self, endpoint: str, params: dict) -> str:
+        """Rate-limited HTTP GET against an E-utilities endpoint."""
+        self._limiter.acquire()
+
         if self.api_key:
             params["api_key"] = self.api_key
         if self.email:
@@ -219,20 +382,15 @@ class NCBIClient:
         url = f"{BASE_URL}/{endpoint}?{urllib.parse.urlencode(params)}"
 
         try:
-            req = urllib.request.Request(
-                url,
-                headers={"User-Agent": "BioAgent/1.0 (Bioinformatics Agent)"},
-            )
+            # Keep-alive session when requests is installed, urllib otherwise
+            session = self._get_session()
+            if session is not None:
+                resp = session.get(url, timeout=30)
+                resp.raise_for_status()
+                return resp.content.decode("utf-8")
+
+            req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
             with urllib.request.urlopen(req, timeout=30) as resp:
                 return resp.read().decode("utf-8")
         except Exception as e:
             return f"Error querying NCBI: {e}"
-
-    def _rate_limit(self):
-        """Enforce NCBI rate limits."""
-        global _last_request_time
-        min_interval = 0.1 if self.api_key else 0.34  # 10/s or 3/s
-        elapsed = time.time() - _last_request_time
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        _last_request_time = time.time()
@@ -5,21 +5,154 @@ Provides access to protein structures, ligand binding sites,
 experimental metadata, and structural annotations.
 """
 
+import gzip
 import json
+import re
+import threading
 import time
 import urllib.parse
 import urllib.request
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+from .rate_limit import TokenBucket
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
 
 BASE_URL = "https://data.rcsb.org/rest/v1"
 SEARCH_URL = "https://search.rcsb.org/rcsbsearch/v2/query"
+GRAPHQL_URL = "https://data.rcsb.org/graphql"
+USER_AGENT = "BioAgent/1.0 (Bioinformatics Agent)"
+# requests negotiates compression itself; urllib needs it asked for
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+def _loads(text: str):
+    """Parse a JSON response body (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _dumps(obj) -> bytes:
+    """Serialize a JSON request body to UTF-8 bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _read_body(resp) -> str:
+    """Read and decode a urllib response, undoing gzip/deflate transfer encoding."""
+    raw = resp.read()
+    encoding = resp.headers.get("Content-Encoding", "").lower()
+    if encoding == "gzip":
+        raw = gzip.decompress(raw)
+    elif encoding == "deflate":
+        raw = zlib.decompress(raw)
+    return raw.decode("utf-8")
+
+
+# Classic 4-character PDB IDs (digit 1-9 then 3 alphanumerics) and the
+# extended pdb_0000XXXX form; checked after upper-casing
+_PDB_ID_RE = re.compile(r"[1-9][A-Z0-9]{3}|PDB_[0-9]{4}[1-9][A-Z0-9]{3}")
+
+# Full-text search request body with the query (JSON-encoded) and row count
+# left open, so only those two values are serialized per call
+_SEARCH_TEMPLATE = (
+    b'{"query":{"type":"terminal","service":"full_text","parameters":{"value":%s}},'
+    b'"return_type":"entry","request_options":{"results_content_type":["experimental"],'
+    b'"sort":[{"sort_by":"score","direction":"desc"}],"paginate":{"start":0,"rows":%d}}}'
+)
+
+# Search hits are {"identifier": ..., "score": ...} records; only the IDs and
+# the total are used, so they are pulled out without building the document
+_SEARCH_TOTAL_RE = re.compile(r'"total_count"\s*:\s*(\d+)')
+_SEARCH_ID_RE = re.compile(r'"identifier"\s*:\s*"([^"\\]*)"')
+
+
+def _parse_search_hits(response: str) -> tuple[int, list[str]]:
+    """Total count and ranked hit IDs from a search response body."""
+    match = _SEARCH_TOTAL_RE.search(response)
+    if match:
+        return int(match.group(1)), _SEARCH_ID_RE.findall(response)
+
+    # Unexpected shape: parse fully so malformed bodies still raise
+    data = _loads(response)
+    results = data.get("result_set", [])
+    return data.get("total_count", 0), [r.get("identifier", "") for r in results]
+
+
+# Only the fields _format_summary() reads. The resolution is aliased to the key
+# it looks up, and organisms (a polymer-entity field) are flattened afterwards.
+_SUMMARY_GQL = """
+query($id: String!) {
+  entry(entry_id: $id) {
+    struct { title }
+    exptl { method }
+    refine { ls_dres_high: ls_d_res_high }
+    rcsb_accession_info { initial_release_date }
+    polymer_entities { rcsb_entity_source_organism { scientific_name } }
+  }
+}
+"""
+
+
+def _check_entry_status(status: int, reason: str) -> None:
+    """Raise PDBRequestError for a failed entry GET."""
+    if status == 404:
+        raise PDBRequestError("Error: PDB entry not found (404)", 404)
+    if status >= 400:
+        raise PDBRequestError(f"Error: HTTP {status} - {reason}", status)
+
+
+def _drop_nulls(value):
+    """Remove GraphQL nulls so missing fields look absent, as in REST documents."""
+    if isinstance(value, dict):
+        return {k: _drop_nulls(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_drop_nulls(v) for v in value if v is not None]
+    return value
+
+
+# Concurrent entry downloads when summarizing search hits
+SUMMARY_WORKERS = 10
+
+# Parsed entry JSON kept per client; fetch, summary and ligands share it
+ENTRY_CACHE_SIZE = 256
+ENTRY_CACHE_TTL = 3600
+
+# Optional on-disk entry cache: key version (bump to invalidate) and lifetime.
+# Released entries rarely change, so parsed documents are kept for a week.
+DISK_CACHE_VERSION = "v1"
+DISK_CACHE_TTL = 7 * 24 * 3600
 
 # PDB allows reasonable request rates, ~5 requests/second
-_last_request_time = 0.0
+RATE_LIMIT = 5
+RATE_BURST = 5
+
+
+class PDBRequestError(Exception):
+    """An RCSB request failed; str(error) is the message shown to the user."""
 
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.status = status
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class PDBResult:
     """Result from a PDB query."""
     data: str
@@ -40,8 +173,86 @@ class PDBResult:
 class PDBClient:
     """Client for the RCSB PDB REST API."""
 
-    def __init__(self, max_retries: int = 2):
+    def __init__(self, max_retries: int = 2, cache_dir: str | None = None):
+        """
+        Args:
+            max_retries: Retries for connection errors and 5xx responses.
+            cache_dir: Directory for an on-disk entry cache (requires diskcache).
+        """
         self.max_retries = max_retries
+        self._session = None
+        self._pool = None
+        # Per client, so independent clients do not throttle each other
+        self._limiter = TokenBucket(RATE_LIMIT, RATE_BURST)
+        self._entry_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._entry_lock = threading.Lock()
+        self._executor = None
+        self._disk_cache = None
+        if cache_dir and DISKCACHE_AVAILABLE:
+            self._disk_cache = diskcache.Cache(cache_dir)
+
+    def _get_session(self):
+        """Return a pooled requests.Session, or None when requests is missing."""
+        if self._session is None:
+            try:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+            except ImportError:
+                return None
+
+            session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=50,
+                max_retries=Retry(
+                    total=self.max_retries,
+                    backoff_factor=0.5,
+                    status_forcelist=[500, 502, 503, 504],
+                    allowed_methods=None,
+                    raise_on_status=False,
+                ),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def _get_pool(self):
+        """Return a keep-alive urllib3.PoolManager for use without requests.
+
+        None when urllib3 is missing too, leaving plain urllib (no pooling).
+        """
+        if self._pool is None:
+            try:
+                import urllib3
+            except ImportError:
+                return None
+
+            self._pool = urllib3.PoolManager(
+                num_pools=4,
+                maxsize=50,
+                headers={"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING},
+                retries=urllib3.Retry(
+                    total=self.max_retries,
+                    backoff_factor=0.5,
+                    status_forcelist=[500, 502, 503, 504],
+                    allowed_methods=None,
+                    raise_on_status=False,
+                ),
+            )
+        return self._pool
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return this client's prefetch thread pool, creating it on first use."""
+        if self._executor is None:
+            with self._entry_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=SUMMARY_WORKERS, thread_name_prefix="pdb-prefetch"
+                    )
+        return self._executor
 
     def query(
         self,
@@ -60,8 +271,6 @@ class PDBClient:
         Returns:
             PDBResult with the response data
         """
-        self._rate_limit()
-
         if operation == "fetch":
             return self._fetch_entry(query)
         elif operation == "search":
@@ -78,22 +287,54 @@ class PDBClient:
                 success=False,
             )
 
+    def query_batch(
+        self,
+        queries: list[str],
+        operation: str = "summary",
+        limit: int = 10,
+        max_workers: int = SUMMARY_WORKERS,
+    ) -> list[PDBResult]:
+        """
+        Run the same operation for many queries concurrently.
+
+        Requests still share this client's rate limit, so throughput is
+        bounded by the ~5 requests/second budget rather than by round trips.
+
+        Args:
+            queries: PDB IDs (or search terms for the search operation)
+            operation: Operation type (fetch, search, ligands, summary)
+            limit: Maximum results for search operations
+            max_workers: Maximum number of concurrent queries
+
+        Returns:
+            PDBResult objects in query order
+        """
+        if not queries:
+            return []
+
+        # Create the shared session up front rather than racing in workers.
+        # A separate pool from the prefetch executor: search queries block
+        # on prefetch futures and must not occupy the threads they wait on.
+        self._get_session()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as pool:
+            return list(pool.map(lambda q: self.query(q, operation, limit), queries))
+
     def _fetch_entry(self, pdb_id: str) -> PDBResult:
         """Fetch detailed information for a PDB entry."""
         pdb_id = pdb_id.upper().strip()
-        url = f"{BASE_URL}/core/entry/{pdb_id}"
-        response = self._request(url)
-
-        if response.startswith("Error"):
+        if not _PDB_ID_RE.fullmatch(pdb_id):
+            return self._invalid_id(pdb_id, "fetch")
+        try:
+            data = self._get_entry(pdb_id)
+        except PDBRequestError as e:
             return PDBResult(
-                data=response,
+                data=str(e),
                 query=pdb_id,
                 operation="fetch",
                 success=False,
             )
 
         try:
-            data = json.loads(response)
             formatted = self._format_entry(data, pdb_id)
             return PDBResult(
                 data=formatted,
@@ -101,9 +342,9 @@ class PDBClient:
                 operation="fetch",
                 success=True,
             )
-        except (json.JSONDecodeError, KeyError) as e:
+        except KeyError as e:
             return PDBResult(
-                data=f"Error parsing response: {e}\nRaw: {response[:2000]}",
+                data=f"Error parsing response: {e}",
                 query=pdb_id,
                 operation="fetch",
                 success=False,
@@ -111,36 +352,12 @@ class PDBClient:
 
     def _search(self, query: str, limit: int) -> PDBResult:
         """Search PDB for structures matching a query."""
-        # Build search request for text search
-        search_request = {
-            "query": {
-                "type": "terminal",
-                "service": "full_text",
-                "parameters": {
-                    "value": query
-                }
-            },
-            "return_type": "entry",
-            "request_options": {
-                "results_content_type": ["experimental"],
-                "sort": [{"sort_by": "score", "direction": "desc"}],
-                "paginate": {"start": 0, "rows": min(limit, 25)}
-            }
-        }
+        # Text search request; the JSON-encoded query escapes user input
+        req_data = _SEARCH_TEMPLATE % (_dumps(query), min(limit, 25))
 
         try:
-            req_data = json.dumps(search_request).encode('utf-8')
-            req = urllib.request.Request(
-                SEARCH_URL,
-                data=req_data,
-                headers={
-                    "Content-Type": "application/json",
-                    "User-Agent": "BioAgent/1.0 (Bioinformatics Agent)",
-                },
-            )
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                response = resp.read().decode("utf-8")
-        except Exception as e:
+            response = self._post(SEARCH_URL, req_data)
+        except PDBRequestError as e:
             return PDBResult(
                 data=f"Error searching PDB: {e}",
                 query=query,
@@ -149,11 +366,16 @@ class PDBClient:
             )
 
         try:
-            data = json.loads(response)
-            total = data.get("total_count", 0)
-            results = data.get("result_set", [])
+            total, hit_ids = _parse_search_hits(response)
+
+            # Start downloading the top entries right away so the requests
+            # are in flight while the rest of the response is handled
+            pdb_ids = hit_ids[:limit]
+            pdb_ids = pdb_ids[:10]  # Limit detailed fetches
+            executor = self._get_executor()
+            prefetch = [executor.submit(self._get_summary_entry, pdb_id) for pdb_id in pdb_ids]
 
-            if not results:
+            if not hit_ids:
                 return PDBResult(
                     data="No structures found matching the query.",
                     query=query,
@@ -162,14 +384,16 @@ class PDBClient:
                     count=0,
                 )
 
-            # Get summaries for found entries
-            pdb_ids = [r.get("identifier", "") for r in results[:limit]]
+            # Format summaries in search ranking order as downloads complete
             formatted_results = []
-
-            for pdb_id in pdb_ids[:10]:  # Limit detailed fetches
-                summary = self._get_summary_data(pdb_id)
-                if summary:
-                    formatted_results.append(summary)
+            for pdb_id, future in zip(pdb_ids, prefetch):
+                entry = future.result()
+                if entry is None:
+                    continue
+                try:
+                    formatted_results.append(self._format_summary(entry, pdb_id))
+                except KeyError:
+                    continue
 
             formatted = "\n---\n".join(formatted_results) if formatted_results else "No details available."
 
@@ -191,19 +415,19 @@ class PDBClient:
     def _get_ligands(self, pdb_id: str) -> PDBResult:
         """Get ligand/binding site information for a PDB entry."""
         pdb_id = pdb_id.upper().strip()
-        url = f"{BASE_URL}/core/entry/{pdb_id}"
-        response = self._request(url)
-
-        if response.startswith("Error"):
+        if not _PDB_ID_RE.fullmatch(pdb_id):
+            return self._invalid_id(pdb_id, "ligands")
+        try:
+            data = self._get_entry(pdb_id)
+        except PDBRequestError as e:
             return PDBResult(
-                data=response,
+                data=str(e),
                 query=pdb_id,
                 operation="ligands",
                 success=False,
             )
 
         try:
-            data = json.loads(response)
             formatted = self._format_ligands(data, pdb_id)
             return PDBResult(
                 data=formatted,
@@ -211,7 +435,7 @@ class PDBClient:
                 operation="ligands",
                 success=True,
             )
-        except (json.JSONDecodeError, KeyError) as e:
+        except KeyError as e:
             return PDBResult(
                 data=f"Error parsing response: {e}",
                 query=pdb_id,
@@ -222,6 +446,8 @@ class PDBClient:
     def _get_summary(self, pdb_id: str) -> PDBResult:
         """Get a brief summary of a PDB entry."""
         pdb_id = pdb_id.upper().strip()
+        if not _PDB_ID_RE.fullmatch(pdb_id):
+            return self._invalid_id(pdb_id, "summary")
         summary = self._get_summary_data(pdb_id)
 
         if summary:
@@ -239,180 +465,239 @@ class PDBClient:
                 success=False,
             )
 
+    def _invalid_id(self, pdb_id: str, operation: str) -> PDBResult:
+        """Result for an ID that cannot exist, returned without a request."""
+        return PDBResult(
+            data=f"Invalid PDB ID format: {pdb_id!r} (expected e.g. '1TUP')",
+            query=pdb_id,
+            operation=operation,
+            success=False,
+        )
+
     def _get_summary_data(self, pdb_id: str) -> str | None:
         """Get formatted summary data for a PDB entry."""
-        url = f"{BASE_URL}/core/entry/{pdb_id}"
-        response = self._request(url)
+        data = self._get_summary_entry(pdb_id)
+        if data is None:
+            return None
 
-        if response.startswith("Error"):
+        try:
+            return self._format_summary(data, pdb_id)
+        except KeyError:
             return None
 
+    def _get_entry(self, pdb_id: str) -> dict:
+        """Parsed core entry JSON for a PDB ID, via a small TTL'd LRU cache
+        backed by the on-disk cache when one is configured.
+
+        Raises PDBRequestError if the entry cannot be fetched or parsed;
+        failures are not cached.
+        """
+        cached = self._cache_lookup(pdb_id)
+        if cached is not None:
+            return cached
+
+        # The disk cache holds the parsed dict, so a hit skips JSON parsing
+        disk_key = (DISK_CACHE_VERSION, "entry", pdb_id)
+        if self._disk_cache is not None:
+            try:
+                data = self._disk_cache.get(disk_key)
+            except Exception:
+                data = None
+            if data is not None:
+                self._cache_store(pdb_id, data)
+                return data
+
+        response = self._request(f"{BASE_URL}/core/entry/{pdb_id}")
+        try:
+            data = _loads(response)
+        except json.JSONDecodeError as e:
+            raise PDBRequestError(
+                f"Error parsing response: {e}\nRaw: {response[:2000]}"
+            ) from e
+
+        self._cache_store(pdb_id, data)
+        if self._disk_cache is not None:
+            try:
+                self._disk_cache.set(disk_key, data, expire=DISK_CACHE_TTL)
+            except Exception:
+                pass
+        return data
+
+    def _get_summary_entry(self, pdb_id: str) -> dict | None:
+        """Just the summary fields of an entry, fetched through GraphQL.
+
+        The trimmed document is cached under its own key. Full REST entries
+        are not reused: they carry neither the aliased resolution nor the
+        flattened organisms, so the summary would depend on call order.
+        None on failure.
+        """
+        key = f"summary:{pdb_id}"
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached
+
+        payload = {"query": _SUMMARY_GQL, "variables": {"id": pdb_id}}
         try:
-            data = json.loads(response)
-
-            title = data.get("struct", {}).get("title", "N/A")
-
-            # Experimental method
-            method = "N/A"
-            exptl = data.get("exptl", [])
-            if exptl:
-                method = exptl[0].get("method", "N/A")
-
-            # Resolution
-            resolution = "N/A"
-            refine = data.get("refine", [])
-            if refine:
-                res = refine[0].get("ls_dres_high")
-                if res:
-                    resolution = f"{res} Å"
-
-            # Release date
-            release_date = data.get("rcsb_accession_info", {}).get("initial_release_date", "N/A")
-            if release_date and release_date != "N/A":
-                release_date = release_date.split("T")[0]
-
-            # Organism
-            organisms = []
-            sources = data.get("rcsb_entry_info", {}).get("polymer_entity_count_protein", 0)
-            entity_src = data.get("rcsb_entity_source_organism", [])
-            for src in entity_src[:3]:
-                org = src.get("scientific_name", "")
-                if org and org not in organisms:
-                    organisms.append(org)
-            organism = ", ".join(organisms) if organisms else "N/A"
-
-            return f"""PDB ID: {pdb_id}
+            entry = _loads(self._post(GRAPHQL_URL, _dumps(payload)))["data"]["entry"]
+        except (PDBRequestError, json.JSONDecodeError, KeyError, TypeError):
+            return None
+        if not entry:
+            return None
+
+        entry = _drop_nulls(entry)
+        entry["rcsb_entity_source_organism"] = [
+            organism
+            for entity in entry.pop("polymer_entities", [])
+            for organism in entity.get("rcsb_entity_source_organism", [])
+        ]
+        self._cache_store(key, entry)
+        return entry
+
+    def _cache_lookup(self, key: str) -> dict | None:
+        """Fresh cached entry for key, or None."""
+        with self._entry_lock:
+            cached = self._entry_cache.get(key)
+            if cached is None or time.monotonic() - cached[0] >= ENTRY_CACHE_TTL:
+                return None
+            self._entry_cache.move_to_end(key)
+            return cached[1]
+
+    def _cache_store(self, key: str, data: dict) -> None:
+        """Insert into the entry cache, evicting least-recently-used entries."""
+        with self._entry_lock:
+            self._entry_cache[key] = (time.monotonic(), data)
+            self._entry_cache.move_to_end(key)
+            while len(self._entry_cache) > ENTRY_CACHE_SIZE:
+                self._entry_cache.popitem(last=False)
+
+    def _format_summary(self, data: dict, pdb_id: str) -> str:
+        """Format the brief summary of a parsed PDB entry."""
+        title = data.get("struct", {}).get("title", "N/A")
+
+        # Experimental method
+        exptl = data.get("exptl")
+        method = exptl[0].get("method", "N/A") if exptl else "N/A"
+
+        # Resolution
+        refine = data.get("refine")
+        res = refine[0].get("ls_dres_high") if refine else None
+        resolution = f"{res} Å" if res else "N/A"
+
+        # Release date
+        release_date = data.get("rcsb_accession_info", {}).get("initial_release_date", "N/A")
+        if release_date and release_date != "N/A":
+            release_date = release_date.split("T")[0]
+
+        # Organism: unique names among the first three sources
+        organisms = dict.fromkeys(
+            org for src in data.get("rcsb_entity_source_organism", [])[:3]
+            if (org := src.get("scientific_name", ""))
+        )
+        organism = ", ".join(organisms) if organisms else "N/A"
+
+        return f"""PDB ID: {pdb_id}
 Title: {title}
 Method: {method}
 Resolution: {resolution}
 Release Date: {release_date}
 Organism: {organism}"""
-        except (json.JSONDecodeError, KeyError):
-            return None
 
     def _format_entry(self, data: dict, pdb_id: str) -> str:
         """Format a full PDB entry for display."""
-        parts = []
-
-        parts.append(f"PDB ID: {pdb_id}")
-
-        # Title
+        # Pull every field up front; optional lines are None and dropped below
         title = data.get("struct", {}).get("title", "N/A")
-        parts.append(f"Title: {title}")
 
-        # Experimental method and resolution
         exptl = data.get("exptl", [])
-        if exptl:
-            method = exptl[0].get("method", "N/A")
-            parts.append(f"Method: {method}")
+        method = exptl[0].get("method", "N/A") if exptl else None
 
         refine = data.get("refine", [])
-        if refine:
-            resolution = refine[0].get("ls_dres_high")
-            if resolution:
-                parts.append(f"Resolution: {resolution} Å")
-            r_factor = refine[0].get("ls_rfactor_rwork")
-            if r_factor:
-                parts.append(f"R-factor: {r_factor}")
+        resolution = refine[0].get("ls_dres_high") if refine else None
+        r_factor = refine[0].get("ls_rfactor_rwork") if refine else None
 
-        # Release date
         release_date = data.get("rcsb_accession_info", {}).get("initial_release_date", "")
-        if release_date:
-            parts.append(f"Release Date: {release_date.split('T')[0]}")
 
-        # Authors
         audit_authors = data.get("audit_author", [])
-        if audit_authors:
-            authors = [a.get("name", "") for a in audit_authors[:5]]
-            author_str = ", ".join(authors)
-            if len(audit_authors) > 5:
-                author_str += f" et al. ({len(audit_authors)} authors)"
-            parts.append(f"Authors: {author_str}")
-
-        # Citation
+        author_str = ", ".join(a.get("name", "") for a in audit_authors[:5])
+        if len(audit_authors) > 5:
+            author_str += f" et al. ({len(audit_authors)} authors)"
+
         citation = data.get("citation", [])
-        if citation:
-            cit = citation[0]
-            journal = cit.get("rcsb_journal_abbrev", "")
-            year = cit.get("year", "")
-            if journal and year:
-                parts.append(f"Citation: {journal} ({year})")
-            pmid = cit.get("pdbx_database_id_PubMed")
-            if pmid:
-                parts.append(f"PubMed ID: {pmid}")
-
-        # Entity information
+        cit = citation[0] if citation else {}
+        journal = cit.get("rcsb_journal_abbrev", "")
+        year = cit.get("year", "")
+        pmid = cit.get("pdbx_database_id_PubMed")
+
         entry_info = data.get("rcsb_entry_info", {})
         polymer_count = entry_info.get("polymer_entity_count", 0)
         protein_count = entry_info.get("polymer_entity_count_protein", 0)
         na_count = entry_info.get("polymer_entity_count_nucleic_acid", 0)
         ligand_count = entry_info.get("nonpolymer_entity_count", 0)
 
-        parts.append(f"\nComposition:")
-        parts.append(f"  Polymer entities: {polymer_count} (Protein: {protein_count}, Nucleic acid: {na_count})")
-        parts.append(f"  Ligands/small molecules: {ligand_count}")
-
-        # Organism
-        entity_src = data.get("rcsb_entity_source_organism", [])
-        organisms = []
-        for src in entity_src:
-            org = src.get("scientific_name", "")
-            if org and org not in organisms:
-                organisms.append(org)
-        if organisms:
-            parts.append(f"  Organism(s): {', '.join(organisms[:3])}")
-
-        # Keywords
+        # Unique organisms, first-seen order
+        organisms = list(dict.fromkeys(
+            org for src in data.get("rcsb_entity_source_organism", [])
+            if (org := src.get("scientific_name", ""))
+        ))
+
         keywords = data.get("struct_keywords", {}).get("pdbx_keywords", "")
-        if keywords:
-            parts.append(f"\nClassification: {keywords}")
 
-        # Assembly info
         assemblies = data.get("rcsb_assembly_info", [])
+        polymer_comp = ""
         if assemblies:
             assembly = assemblies[0] if isinstance(assemblies, list) else assemblies
             polymer_comp = assembly.get("polymer_composition", "")
-            if polymer_comp:
-                parts.append(f"Assembly: {polymer_comp}")
 
-        return "\n".join(parts)
+        return "\n".join(filter(None, (
+            f"PDB ID: {pdb_id}",
+            f"Title: {title}",
+            exptl and f"Method: {method}",
+            resolution and f"Resolution: {resolution} Å",
+            r_factor and f"R-factor: {r_factor}",
+            release_date and f"Release Date: {release_date.split('T')[0]}",
+            audit_authors and f"Authors: {author_str}",
+            journal and year and f"Citation: {journal} ({year})",
+            pmid and f"PubMed ID: {pmid}",
+            "\nComposition:",
+            f"  Polymer entities: {polymer_count} (Protein: {protein_count}, Nucleic acid: {na_count})",
+            f"  Ligands/small molecules: {ligand_count}",
+            organisms and f"  Organism(s): {', '.join(organisms[:3])}",
+            keywords and f"\nClassification: {keywords}",
+            polymer_comp and f"Assembly: {polymer_comp}",
+        )))
 
     def _format_ligands(self, data: dict, pdb_id: str) -> str:
         """Format ligand/binding site information."""
-        parts = [f"Ligands and Binding Sites for {pdb_id}"]
-        parts.append("-" * 50)
+        header = f"Ligands and Binding Sites for {pdb_id}\n{'-' * 50}"
+        entry_info = data.get("rcsb_entry_info", {})
 
         # Get nonpolymer entities (ligands)
-        nonpoly = data.get("rcsb_entry_info", {}).get("nonpolymer_entity_count", 0)
+        nonpoly = entry_info.get("nonpolymer_entity_count", 0)
 
         if nonpoly == 0:
-            parts.append("No ligands found in this structure.")
-            return "\n".join(parts)
+            return f"{header}\nNo ligands found in this structure."
 
-        parts.append(f"Total ligands/small molecules: {nonpoly}")
+        parts = [header, f"Total ligands/small molecules: {nonpoly}"]
 
         # Try to get binding site info
         binding_sites = data.get("rcsb_binding_affinity", [])
         if binding_sites:
-            parts.append(f"\nBinding Affinity Data:")
-            for site in binding_sites[:10]:
-                comp_id = site.get("comp_id", "?")
-                affinity = site.get("value", "?")
-                unit = site.get("unit", "")
-                aff_type = site.get("type", "")
-                parts.append(f"  {comp_id}: {aff_type} = {affinity} {unit}")
+            parts.append("\nBinding Affinity Data:")
+            parts.extend(
+                f"  {site.get('comp_id', '?')}: {site.get('type', '')} = "
+                f"{site.get('value', '?')} {site.get('unit', '')}"
+                for site in binding_sites[:10]
+            )
 
         # Struct site information
         struct_site = data.get("struct_site", [])
         if struct_site:
-            parts.append(f"\nDefined Sites:")
-            for site in struct_site[:10]:
-                site_id = site.get("id", "?")
-                details = site.get("details", "")
-                parts.append(f"  {site_id}: {details[:100]}")
+            parts.append("\nDefined Sites:")
+            parts.extend(
+                f"  {site.get('id', '?')}: {site.get('details', '')[:100]}"
+                for site in struct_site[:10]
+            )
 
         # Get info about small molecule components
-        entry_info = data.get("rcsb_entry_info", {})
         if entry_info:
             # Drug-like molecules
             has_drug = entry_info.get("structure_determination_methodology", "")
@@ -421,36 +706,90 @@ Organism: {organism}"""
         return "\n".join(parts)
 
     def _request(self, url: str) -> str:
-        """Make an HTTP request to PDB."""
+        """Make an HTTP GET to PDB; raises PDBRequestError on failure."""
+        self._rate_limit()
+        session = self._get_session()
+        if session is not None:
+            # Retries on connection errors and 5xx are handled by the adapter
+            try:
+                resp = session.get(url, headers={"Accept": "application/json"}, timeout=30)
+            except Exception as e:
+                raise PDBRequestError(f"Error querying PDB: {e}") from e
+            _check_entry_status(resp.status_code, resp.reason)
+            return resp.content.decode("utf-8")
+
+        pool = self._get_pool()
+        if pool is not None:
+            # urllib3 retries and decompresses like the requests adapter
+            try:
+                resp = pool.request(
+                    "GET", url, headers={"Accept": "application/json"}, timeout=30
+                )
+            except Exception as e:
+                raise PDBRequestError(f"Error querying PDB: {e}") from e
+            _check_entry_status(resp.status, resp.reason)
+            return resp.data.decode("utf-8")
+
         for attempt in range(self.max_retries + 1):
             try:
                 req = urllib.request.Request(
                     url,
                     headers={
-                        "User-Agent": "BioAgent/1.0 (Bioinformatics Agent)",
+                        "User-Agent": USER_AGENT,
                         "Accept": "application/json",
+                        "Accept-Encoding": ACCEPT_ENCODING,
                     },
                 )
                 with urllib.request.urlopen(req, timeout=30) as resp:
-                    return resp.read().decode("utf-8")
+                    return _read_body(resp)
             except urllib.error.HTTPError as e:
-                if e.code == 404:
-                    return f"Error: PDB entry not found (404)"
-                else:
-                    return f"Error: HTTP {e.code} - {e.reason}"
+                _check_entry_status(e.code, e.reason)
+                raise PDBRequestError(f"Error: HTTP {e.code} - {e.reason}", e.code) from e
             except Exception as e:
                 if attempt < self.max_retries:
                     time.sleep(0.5)
                     continue
-                return f"Error querying PDB: {e}"
+                raise PDBRequestError(f"Error querying PDB: {e}") from e
+
+        raise PDBRequestError("Error: Max retries exceeded")
+
+    def _post(self, url: str, body: bytes) -> str:
+        """Rate-limited JSON POST; raises PDBRequestError on failure."""
+        self._rate_limit()
+        headers = {"Content-Type": "application/json"}
+
+        try:
+            # Keep-alive session when requests is installed, then a urllib3
+            # pool, and plain urllib as the last resort
+            session = self._get_session()
+            if session is not None:
+                resp = session.post(url, data=body, headers=headers, timeout=30)
+                resp.raise_for_status()
+                return resp.content.decode("utf-8")
+
+            pool = self._get_pool()
+            if pool is not None:
+                resp = pool.request("POST", url, body=body, headers=headers, timeout=30)
+                if resp.status >= 400:
+                    raise PDBRequestError(f"{resp.status} {resp.reason}", resp.status)
+                return resp.data.decode("utf-8")
 
-        return "Error: Max retries exceeded"
+            req = urllib.request.Request(
+                url,
+                data=body,
+                headers={
+                    **headers,
+                    "User-Agent": USER_AGENT,
+                    "Accept-Encoding": ACCEPT_ENCODING,
+                },
+            )
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                return _read_body(resp)
+        except PDBRequestError:
+            raise
+        except Exception as e:
+            raise PDBRequestError(str(e)) from e
 
     def _rate_limit(self):
-        """Enforce rate limits (~5 requests/second)."""
-        global _last_request_time
-        min_interval = 0.2  # 5 requests per second
-        elapsed = time.time() - _last_request_time
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        _last_request_time = time.time()
+        """Enforce rate limits (~5 requests/second, short bursts allowed)."""
+        self._limiter.acquire()
@@ -0,0 +1,65 @@
+"""
+Client-side rate limiters shared by the database clients.
+
+Both limiters are thread-safe and block in acquire() until a call is allowed.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class TokenBucket:
+    """Token bucket: `rate` calls per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """Take a token if one is available; otherwise return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last_refill) * self.rate
+            )
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while (wait := self.take()) > 0:
+            time.sleep(wait)
+
+
+class SlidingWindowLimiter:
+    """Sliding-window limiter: at most `rate` calls per `period` seconds.
+
+    Unlike fixed gaps between calls, requests may burst up to the full
+    allowance and concurrent callers share it fairly.
+    """
+
+    def __init__(self, rate: int, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self._calls: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call is allowed, then record it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.rate:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(wait)
@@ -5,18 +5,118 @@ Provides access to curated human pathways with mechanistic detail,
 pathway enrichment analysis, and reaction information.
 """
 
+import io
 import json
+import re
+import threading
 import time
 import urllib.parse
 import urllib.request
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from .rate_limit import TokenBucket
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
 
 
 BASE_URL = "https://reactome.org/ContentService"
 ANALYSIS_URL = "https://reactome.org/AnalysisService"
+USER_AGENT = "BioAgent/1.0 (Bioinformatics Agent)"
+
+# Highlighting markup that the search service wraps around matched terms
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+# Every endpoint used here returns a JSON object or array; anything else (an
+# HTML maintenance page, say) is passed through but never cached
+_JSON_START_RE = re.compile(rb"\s*[\[{]")
+
+
+def _loads(body: bytes):
+    """Parse a JSON response body straight from bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+# Exceptions raised while decoding a response body
+_PARSE_ERRORS = (json.JSONDecodeError, KeyError) + ((ijson.JSONError,) if IJSON_AVAILABLE else ())
+
+
+@dataclass(slots=True)
+class _ContainedEvents:
+    """Leading sub-pathways and reactions of a containedEvents array, with full counts."""
+    total: int = 0
+    sub_pathways: list = field(default_factory=list)
+    n_sub_pathways: int = 0
+    reactions: list = field(default_factory=list)
+    n_reactions: int = 0
+
+
+def _iter_events(body: bytes):
+    """Yield the items of a JSON array body, streaming with ijson when available."""
+    if IJSON_AVAILABLE:
+        return ijson.items(io.BytesIO(body), "item")
+    events = _loads(body)
+    return events if isinstance(events, list) else ()
+
 
-# Reactome allows reasonable request rates
-_last_request_time = 0.0
+def _partition_events(body: bytes, keep: int) -> _ContainedEvents:
+    """Split a containedEvents body into sub-pathways and reactions in one pass.
+
+    Large pathways list thousands of events but only the first `keep` of
+    each kind are displayed, so the rest are counted and dropped.
+    """
+    events = _ContainedEvents()
+    for e in _iter_events(body):
+        events.total += 1
+        if not isinstance(e, dict):
+            continue
+        schema_class = e.get("schemaClass")
+        if schema_class == "Pathway":
+            events.n_sub_pathways += 1
+            if events.n_sub_pathways <= keep:
+                events.sub_pathways.append(e)
+        elif schema_class == "Reaction":
+            events.n_reactions += 1
+            if events.n_reactions <= keep:
+                events.reactions.append(e)
+    return events
+
+
+# Response caches keyed on URL. Content only changes between Reactome
+# releases, so disk entries live for a week; bump the version to invalidate.
+MEMORY_CACHE_SIZE = 512
+CACHE_VERSION = "v1"
+CACHE_TTL = 7 * 24 * 3600
+
+# Default concurrency for query_batch
+BATCH_WORKERS = 10
+
+# Reactome allows reasonable request rates, ~5 requests/second
+RATE_LIMIT = 5
+RATE_BURST = 5
+
+
+# Shared by all clients and threads, like the single timestamp it replaces
+_bucket = TokenBucket(RATE_LIMIT, RATE_BURST)
 
 
 @dataclass
@@ -40,8 +140,57 @@ class ReactomeResult:
 class ReactomeClient:
     """Client for the Reactome REST API."""
 
-    def __init__(self, max_retries: int = 2):
+    def __init__(self, max_retries: int = 2, cache_dir: str | None = None):
+        """
+        Args:
+            max_retries: Retries for connection errors and 5xx responses.
+            cache_dir: Directory for an on-disk response cache (requires diskcache).
+        """
         self.max_retries = max_retries
+        self._session = None
+        self._memory_cache: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._disk_cache = None
+        self._executor = None
+        if cache_dir and DISKCACHE_AVAILABLE:
+            self._disk_cache = diskcache.Cache(cache_dir)
+
+    def _get_session(self):
+        """Return a pooled requests.Session, or None when requests is missing."""
+        if self._session is None:
+            try:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+            except ImportError:
+                return None
+
+            session = requests.Session()
+            session.headers.update({"User-Agent": USER_AGENT, "Accept": "application/json"})
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+                max_retries=Retry(
+                    total=self.max_retries,
+                    backoff_factor=0.5,
+                    status_forcelist=[500, 502, 503, 504],
+                    raise_on_status=False,
+                ),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return this client's side-request thread pool, creating it on first use."""
+        if self._executor is None:
+            with self._memory_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=BATCH_WORKERS, thread_name_prefix="reactome-fetch"
+                    )
+        return self._executor
 
     def query(
         self,
@@ -62,8 +211,6 @@ class ReactomeClient:
         Returns:
             ReactomeResult with the response data
         """
-        self._rate_limit()
-
         if operation == "pathway":
             return self._get_pathway(query)
         elif operation == "search":
@@ -80,19 +227,51 @@ class ReactomeClient:
                 success=False,
             )
 
+    def query_batch(
+        self,
+        queries: list[str],
+        operation: str = "genes",
+        species: str = "Homo sapiens",
+        limit: int = 20,
+        max_workers: int = BATCH_WORKERS,
+    ) -> list[ReactomeResult]:
+        """
+        Run the same operation for many queries concurrently.
+
+        Args:
+            queries: Pathway IDs, gene symbols, or search terms
+            operation: Operation type (pathway, search, genes, reactions)
+            species: Species name (default: Homo sapiens)
+            limit: Maximum results for search
+            max_workers: Maximum number of concurrent queries
+
+        Returns:
+            ReactomeResult objects in query order
+        """
+        if not queries:
+            return []
+
+        # Create the shared session up front rather than racing in workers
+        self._get_session()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as pool:
+            return list(pool.map(
+                lambda q: self.query(q, operation, species, limit), queries
+            ))
+
     def _get_pathway(self, pathway_id: str) -> ReactomeResult:
         """Get details for a Reactome pathway."""
         pathway_id = pathway_id.strip()
         url = f"{BASE_URL}/data/pathway/{pathway_id}/containedEvents"
-        response = self._request(url)
-
-        # Also get pathway details
         detail_url = f"{BASE_URL}/data/query/{pathway_id}"
-        detail_response = self._request(detail_url)
 
-        if response.startswith("Error") and detail_response.startswith("Error"):
+        # Fetch pathway details alongside the contained events
+        detail_future = self._get_executor().submit(self._request, detail_url)
+        response = self._request(url)
+        detail_response = detail_future.result()
+
+        if response.startswith(b"Error") and detail_response.startswith(b"Error"):
             return ReactomeResult(
-                data=detail_response,
+                data=detail_response.decode("utf-8"),
                 query=pathway_id,
                 operation="pathway",
                 success=False,
@@ -101,13 +280,13 @@ class ReactomeClient:
         try:
             # Parse pathway details
             details = {}
-            if not detail_response.startswith("Error"):
-                details = json.loads(detail_response)
+            if not detail_response.startswith(b"Error"):
+                details = _loads(detail_response)
 
             # Parse contained events
-            events = []
-            if not response.startswith("Error"):
-                events = json.loads(response)
+            events = _ContainedEvents()
+            if not response.startswith(b"Error"):
+                events = _partition_events(response, keep=10)
 
             formatted = self._format_pathway(details, events, pathway_id)
             return ReactomeResult(
@@ -115,9 +294,10 @@ class ReactomeClient:
                 query=pathway_id,
                 operation="pathway",
                 success=True,
-                count=len(events) if events else None,
+                count=events.total or None,
             )
-        except (json.JSONDecodeError, KeyError) as e:
+        except _PARSE_ERRORS as e:
+            self._evict(url, detail_url)
             return ReactomeResult(
                 data=f"Error parsing response: {e}",
                 query=pathway_id,
@@ -132,16 +312,16 @@ class ReactomeClient:
         url = f"{BASE_URL}/search/query?query={encoded_query}&species={encoded_species}&types=Pathway&cluster=true"
         response = self._request(url)
 
-        if response.startswith("Error"):
+        if response.startswith(b"Error"):
             return ReactomeResult(
-                data=response,
+                data=response.decode("utf-8"),
                 query=query,
                 operation="search",
                 success=False,
             )
 
         try:
-            data = json.loads(response)
+            data = _loads(response)
             results = data.get("results", [])
 
             if not results:
@@ -168,6 +348,7 @@ class ReactomeClient:
                 count=len(all_entries),
             )
         except (json.JSONDecodeError, KeyError) as e:
+            self._evict(url)
             return ReactomeResult(
                 data=f"Error parsing response: {e}",
                 query=query,
@@ -183,16 +364,16 @@ class ReactomeClient:
         url = f"{BASE_URL}/search/query?query={encoded_gene}&species={encoded_species}&types=Pathway&cluster=true"
         response = self._request(url)
 
-        if response.startswith("Error"):
+        if response.startswith(b"Error"):
             return ReactomeResult(
-                data=response,
+                data=response.decode("utf-8"),
                 query=gene,
                 operation="genes",
                 success=False,
             )
 
         try:
-            data = json.loads(response)
+            data = _loads(response)
             results = data.get("results", [])
 
             if not results:
@@ -219,6 +400,7 @@ class ReactomeClient:
                 count=len(all_entries),
             )
         except (json.JSONDecodeError, KeyError) as e:
+            self._evict(url)
             return ReactomeResult(
                 data=f"Error parsing response: {e}",
                 query=gene,
@@ -232,27 +414,27 @@ class ReactomeClient:
         url = f"{BASE_URL}/data/pathway/{pathway_id}/containedEvents"
         response = self._request(url)
 
-        if response.startswith("Error"):
+        if response.startswith(b"Error"):
             return ReactomeResult(
-                data=response,
+                data=response.decode("utf-8"),
                 query=pathway_id,
                 operation="reactions",
                 success=False,
             )
 
         try:
-            data = json.loads(response)
-            reactions = [e for e in data if e.get("schemaClass") == "Reaction"]
+            events = _partition_events(response, keep=20)
 
-            formatted = self._format_reactions(reactions, pathway_id)
+            formatted = self._format_reactions(events.reactions, events.n_reactions, pathway_id)
             return ReactomeResult(
                 data=formatted,
                 query=pathway_id,
                 operation="reactions",
                 success=True,
-                count=len(reactions),
+                count=events.n_reactions,
             )
-        except (json.JSONDecodeError, KeyError) as e:
+        except _PARSE_ERRORS as e:
+            self._evict(url)
             return ReactomeResult(
                 data=f"Error parsing response: {e}",
                 query=pathway_id,
@@ -260,7 +442,7 @@ class ReactomeClient:
                 success=False,
             )
 
-    def _format_pathway(self, details: dict, events: list, pathway_id: str) -> str:
+    def _format_pathway(self, details: dict, events: _ContainedEvents, pathway_id: str) -> str:
         """Format pathway details."""
         parts = []
 
@@ -287,22 +469,18 @@ class ReactomeClient:
                 parts.append(f"\nCompartments: {', '.join(comp_names)}")
 
         # Sub-pathways and reactions
-        if events and isinstance(events, list):
-            sub_pathways = [e for e in events if isinstance(e, dict) and e.get("schemaClass") == "Pathway"]
-            reactions = [e for e in events if isinstance(e, dict) and e.get("schemaClass") == "Reaction"]
-
-            if sub_pathways:
-                parts.append(f"\nSub-pathways ({len(sub_pathways)}):")
-                for sp in sub_pathways[:10]:
-                    sp_id = sp.get("stId", "")
-                    sp_name = sp.get("displayName", "")
-                    parts.append(f"  - {sp_id}: {sp_name}")
-
-            if reactions:
-                parts.append(f"\nReactions ({len(reactions)}):")
-                for r in reactions[:10]:
-                    r_name = r.get("displayName", "")
-                    parts.append(f"  - {r_name}")
+        if events.sub_pathways:
+            parts.append(f"\nSub-pathways ({events.n_sub_pathways}):")
+            for sp in events.sub_pathways[:10]:
+                sp_id = sp.get("stId", "")
+                sp_name = sp.get("displayName", "")
+                parts.append(f"  - {sp_id}: {sp_name}")
+
+        if events.reactions:
+            parts.append(f"\nReactions ({events.n_reactions}):")
+            for r in events.reactions[:10]:
+                r_name = r.get("displayName", "")
+                parts.append(f"  - {r_name}")
 
         # Literature references
         lit_refs = details.get("literatureReference", [])
@@ -312,9 +490,11 @@ class ReactomeClient:
                 title = ref.get("title", "")
                 pubmed = ref.get("pubMedIdentifier", "")
                 if title:
-                    parts.append(f"  - {title[:80]}{'...' if len(title) > 80 else ''}")
+                    ellipsis = "..." if len(title) > 80 else ""
                     if pubmed:
-                        parts.append(f"    PMID: {pubmed}")
+                        parts.append(f"  - {title[:80]}{ellipsis}\n    PMID: {pubmed}")
+                    else:
+                        parts.append(f"  - {title[:80]}{ellipsis}")
 
         return "\n".join(parts)
 
@@ -326,11 +506,14 @@ class ReactomeClient:
         for entry in entries:
             st_id = entry.get("stId", "N/A")
             name = entry.get("name", "N/A")
-            species = entry.get("species", [""])[0] if entry.get("species") else ""
+            species = entry.get("species")
+            species = species[0] if species else ""
 
-            parts.append(f"\n{st_id}: {name}")
+            # One string per entry keeps the parts list (and the join) short
             if species:
-                parts.append(f"  Species: {species}")
+                parts.append(f"\n{st_id}: {name}\n  Species: {species}")
+            else:
+                parts.append(f"\n{st_id}: {name}")
 
         return "\n".join(parts)
 
@@ -345,9 +528,10 @@ class ReactomeClient:
             name = pathway.get("displayName", "")
             species = pathway.get("speciesName", "")
 
-            parts.append(f"\n{st_id}: {name}")
             if species:
-                parts.append(f"  Species: {species}")
+                parts.append(f"\n{st_id}: {name}\n  Species: {species}")
+            else:
+                parts.append(f"\n{st_id}: {name}")
 
         if len(pathways) > 25:
             parts.append(f"\n... and {len(pathways) - 25} more pathways")
@@ -359,24 +543,25 @@ class ReactomeClient:
         parts = [f"Reactome Pathways for {gene}"]
         parts.append("-" * 50)
 
-        import re
         for entry in entries[:25]:
             st_id = entry.get("stId", "N/A")
             # Remove HTML highlighting tags from name
             name = entry.get("name", "N/A")
-            name = re.sub(r'<[^>]+>', '', name)
-            species = entry.get("species", [""])[0] if entry.get("species") else ""
+            name = _HTML_TAG_RE.sub('', name)
+            species = entry.get("species")
+            species = species[0] if species else ""
 
-            parts.append(f"\n{st_id}: {name}")
             if species:
-                parts.append(f"  Species: {species}")
+                parts.append(f"\n{st_id}: {name}\n  Species: {species}")
+            else:
+                parts.append(f"\n{st_id}: {name}")
 
         if len(entries) > 25:
             parts.append(f"\n... and {len(entries) - 25} more pathways")
 
         return "\n".join(parts)
 
-    def _format_reactions(self, reactions: list, pathway_id: str) -> str:
+    def _format_reactions(self, reactions: list, total: int, pathway_id: str) -> str:
         """Format reactions in a pathway."""
         parts = [f"Reactions in {pathway_id}"]
         parts.append("-" * 50)
@@ -386,42 +571,101 @@ class ReactomeClient:
             st_id = rxn.get("stId", "")
             parts.append(f"\n{st_id}: {name}")
 
-        if len(reactions) > 20:
-            parts.append(f"\n... and {len(reactions) - 20} more reactions")
+        if total > 20:
+            parts.append(f"\n... and {total - 20} more reactions")
 
         return "\n".join(parts)
 
-    def _request(self, url: str) -> str:
-        """Make an HTTP request to Reactome."""
+    def _request(self, url: str) -> bytes:
+        """Make an HTTP request to Reactome, returning the raw body.
+
+        Successful bodies are served from the in-memory LRU or the disk
+        cache when present. Failures come back as a UTF-8 message starting
+        with b"Error" and are never cached, nor are bodies that are not
+        JSON; callers evict bodies that later fail to parse.
+        """
+        with self._memory_lock:
+            body = self._memory_cache.get(url)
+            if body is not None:
+                self._memory_cache.move_to_end(url)
+                return body
+
+        disk_key = (CACHE_VERSION, url)
+        if self._disk_cache is not None:
+            try:
+                body = self._disk_cache.get(disk_key)
+            except Exception:
+                body = None
+
+        if body is None:
+            body = self._fetch(url)
+            if body.startswith(b"Error") or not _JSON_START_RE.match(body):
+                return body
+            if self._disk_cache is not None:
+                try:
+                    self._disk_cache.set(disk_key, body, expire=CACHE_TTL)
+                except Exception:
+                    pass
+
+        with self._memory_lock:
+            self._memory_cache[url] = body
+            self._memory_cache.move_to_end(url)
+            while len(self._memory_cache) > MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+        return body
+
+    def _evict(self, *urls: str) -> None:
+        """Drop cached bodies, e.g. ones that turned out not to parse."""
+        with self._memory_lock:
+            for url in urls:
+                self._memory_cache.pop(url, None)
+        if self._disk_cache is not None:
+            for url in urls:
+                try:
+                    self._disk_cache.delete((CACHE_VERSION, url))
+                except Exception:
+                    pass
+
+    def _fetch(self, url: str) -> bytes:
+        """Rate-limited HTTP GET against Reactome."""
+        self._rate_limit()
+        session = self._get_session()
+        if session is not None:
+            # Retries on connection errors and 5xx are handled by the adapter
+            try:
+                resp = session.get(url, timeout=30)
+            except Exception as e:
+                return f"Error querying Reactome: {e}".encode("utf-8")
+            if resp.status_code == 404:
+                return b"Error: Entry not found (404)"
+            if resp.status_code >= 400:
+                return f"Error: HTTP {resp.status_code} - {resp.reason}".encode("utf-8")
+            return resp.content
+
         for attempt in range(self.max_retries + 1):
             try:
                 req = urllib.request.Request(
                     url,
                     headers={
-                        "User-Agent": "BioAgent/1.0 (Bioinformatics Agent)",
+                        "User-Agent": USER_AGENT,
                         "Accept": "application/json",
                     },
                 )
                 with urllib.request.urlopen(req, timeout=30) as resp:
-                    return resp.read().decode("utf-8")
+                    return resp.read()
             except urllib.error.HTTPError as e:
                 if e.code == 404:
-                    return f"Error: Entry not found (404)"
+                    return b"Error: Entry not found (404)"
                 else:
-                    return f"Error: HTTP {e.code} - {e.reason}"
+                    return f"Error: HTTP {e.code} - {e.reason}".encode("utf-8")
             except Exception as e:
                 if attempt < self.max_retries:
                     time.sleep(0.5)
                     continue
-                return f"Error querying Reactome: {e}"
+                return f"Error querying Reactome: {e}".encode("utf-8")
 
-        return "Error: Max retries exceeded"
+        return b"Error: Max retries exceeded"
 
     def _rate_limit(self):
-        """Enforce rate limits."""
-        global _last_request_time
-        min_interval = 0.2
-        elapsed = time.time() - _last_request_time
-        if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
-        _last_request_time = time.time()
+        """Enforce rate limits (~5 requests/second, short bursts allowed)."""
+        _bucket.acquire()
@@ -9,15 +9,62 @@ ChromaDB cannot be installed (e.g., Python 3.14 without onnxruntime).
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
+import time
 import uuid
-import numpy as np
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, TYPE_CHECKING
 
 from .types import RAGResult, estimate_tokens
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# NumPy is imported inside the methods that need it so that importing this
+# module (e.g. via memory.get_vector_store) stays cheap until a store is used.
+
+
+# Embeddings are L2-normalized before they reach ChromaDB, so inner product
+# gives the same ranking as cosine without Chroma re-normalizing each pair.
+# Collections created before this change keep "cosine" until clear() rebuilds
+# them; both spaces report distance as 1 - similarity for unit vectors.
+_CHROMA_SPACE = "ip"
+
+
+def _content_hash(content: str) -> str:
+    """Stable fingerprint used to detect re-ingested documents."""
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+_METADATA_SCALARS = frozenset({str, int, float, bool})
+
+# Metadata rows fetched per collection.get() call while ranking get_recent
+_RECENT_PAGE_SIZE = 1000
+
+
+def _coerce_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
+    """Copy of metadata with values ChromaDB cannot store stringified.
+
+    Always returns a new dict, so callers' dicts are left untouched and one
+    dict can be shared by several items of a batch. The exact-type check
+    short-circuits the common all-scalar case.
+    """
+    return {
+        key: value
+        if type(value) in _METADATA_SCALARS or isinstance(value, (str, int, float, bool))
+        else str(value)
+        for key, value in metadata.items()
+    }
+
 
 class VectorStoreResult:
     """Result of a vector store operation."""
@@ -28,11 +75,13 @@ class VectorStoreResult:
         message: str,
         results: list[RAGResult] | None = None,
         document_id: str | None = None,
+        document_ids: list[str] | None = None,
     ):
         self.success = success
         self.message = message
         self.results = results or []
         self.document_id = document_id
+        self.document_ids = document_ids or []
 
     def to_string(self) -> str:
         """Format for Claude."""
@@ -42,6 +91,9 @@ class VectorStoreResult:
         if self.document_id:
             return f"Document indexed successfully (ID: {self.document_id})"
 
+        if self.document_ids:
+            return f"{len(self.document_ids)} document(s) indexed successfully"
+
         if not self.results:
             return "No relevant results found in memory."
 
@@ -82,6 +134,9 @@ class SimpleVectorStore:
         self._embedding_model = None
         self._documents: list[dict] = []
         self._vectors: np.ndarray | None = None
+        self._vectors_gpu = None  # torch.Tensor mirror of normalized vectors
+        self._device: str | None = None
+        self._hashes: dict[str, str] = {}  # content hash -> document ID
         self._initialized = False
 
     def _ensure_initialized(self) -> bool:
@@ -92,6 +147,7 @@ class SimpleVectorStore:
         try:
             from sentence_transformers import SentenceTransformer
             self._embedding_model = SentenceTransformer(self.embedding_model_name)
+            self._device = self._detect_cuda_device()
             self._load_data()
             self._initialized = True
             return True
@@ -104,25 +160,90 @@ class SimpleVectorStore:
 
     def _load_data(self) -> None:
         """Load documents and vectors from disk."""
+        import numpy as np
+
         if self.index_file.exists():
             try:
-                with open(self.index_file, "r", encoding="utf-8") as f:
-                    self._documents = json.load(f)
-            except (json.JSONDecodeError, IOError):
+                raw = self.index_file.read_bytes()
+                self._documents = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+            except (ValueError, IOError):
                 self._documents = []
 
+        self._hashes = {
+            doc.get("content_hash") or _content_hash(doc.get("content", "")): doc["id"]
+            for doc in self._documents
+        }
+
         if self.vectors_file.exists() and self._documents:
             try:
                 self._vectors = np.load(self.vectors_file)
             except (IOError, ValueError):
                 self._vectors = None
 
+        self._sync_gpu_vectors()
+
+    def _detect_cuda_device(self) -> str | None:
+        """Return the encoder's CUDA device, or None to search on the CPU.
+
+        The GPU path is only used when the embedding model already lives on
+        CUDA, so no extra device context is created just for search.
+        """
+        try:
+            import torch
+        except ImportError:
+            return None
+
+        if not torch.cuda.is_available():
+            return None
+
+        device = getattr(self._embedding_model, "device", None)
+        if device is None or getattr(device, "type", None) != "cuda":
+            return None
+        return str(device)
+
+    def _sync_gpu_vectors(self) -> None:
+        """Mirror the normalized document vectors onto the GPU."""
+        import numpy as np
+
+        if self._device is None or self._vectors is None or len(self._vectors) == 0:
+            self._vectors_gpu = None
+            return
+
+        import torch
+
+        vectors = torch.from_numpy(np.ascontiguousarray(self._vectors, dtype=np.float32))
+        vectors = vectors.to(self._device, non_blocking=True)
+        self._vectors_gpu = torch.nn.functional.normalize(vectors, dim=1, eps=1e-8)
+
+    def _append_gpu_vector(self, embedding: np.ndarray) -> None:
+        """Append one vector to the GPU mirror without re-uploading the rest."""
+        import numpy as np
+
+        if self._device is None:
+            return
+        if self._vectors_gpu is None:
+            self._sync_gpu_vectors()
+            return
+
+        import torch
+
+        row = torch.from_numpy(np.asarray(embedding, dtype=np.float32).reshape(1, -1))
+        row = torch.nn.functional.normalize(row.to(self._device), dim=1, eps=1e-8)
+        self._vectors_gpu = torch.cat([self._vectors_gpu, row])
+
     def _save_data(self) -> None:
         """Save documents and vectors to disk."""
-        with open(self.index_file, "w", encoding="utf-8") as f:
-            json.dump(self._documents, f, indent=2, default=str)
+        if ORJSON_AVAILABLE:
+            self.index_file.write_bytes(
+                orjson.dumps(self._documents, default=str, option=orjson.OPT_NON_STR_KEYS)
+            )
+        else:
+            with open(self.index_file, "w", encoding="utf-8") as f:
+                json.dump(self._documents, f, separators=(",", ":"), default=str)
 
         if self._vectors is not None and len(self._vectors) > 0:
+            import numpy as np
+
             np.save(self.vectors_file, self._vectors)
 
     def _embed(self, texts: list[str]) -> np.ndarray:
@@ -131,6 +252,15 @@ class SimpleVectorStore:
 
     def _cosine_similarity(self, query_vec: np.ndarray, doc_vecs: np.ndarray) -> np.ndarray:
         """Compute cosine similarity between query and documents."""
+        import numpy as np
+
+        if self._vectors_gpu is not None and doc_vecs is self._vectors:
+            import torch
+
+            query = torch.from_numpy(np.asarray(query_vec, dtype=np.float32)).to(self._device)
+            query = torch.nn.functional.normalize(query, dim=0, eps=1e-8)
+            return (self._vectors_gpu @ query).cpu().numpy()
+
         # Normalize vectors
         query_norm = query_vec / (np.linalg.norm(query_vec) + 1e-8)
         doc_norms = doc_vecs / (np.linalg.norm(doc_vecs, axis=1, keepdims=True) + 1e-8)
@@ -156,6 +286,14 @@ class SimpleVectorStore:
                 message="Cannot index empty content",
             )
 
+        content_hash = _content_hash(content)
+        if content_hash in self._hashes:
+            return VectorStoreResult(
+                success=True,
+                message="Duplicate content already indexed",
+                document_id=self._hashes[content_hash],
+            )
+
         if not document_id:
             document_id = str(uuid.uuid4())
 
@@ -166,18 +304,23 @@ class SimpleVectorStore:
         doc = {
             "id": document_id,
             "content": content,
+            "content_hash": content_hash,
             "source": source,
             "metadata": metadata or {},
             "timestamp": datetime.now().isoformat(),
         }
         self._documents.append(doc)
+        self._hashes[content_hash] = document_id
 
         # Add to vectors
         if self._vectors is None:
             self._vectors = embedding.reshape(1, -1)
         else:
+            import numpy as np
+
             self._vectors = np.vstack([self._vectors, embedding])
 
+        self._append_gpu_vector(embedding)
         self._save_data()
 
         return VectorStoreResult(
@@ -194,6 +337,8 @@ class SimpleVectorStore:
         min_similarity: float | None = None,
     ) -> VectorStoreResult:
         """Search for relevant documents."""
+        import numpy as np
+
         if not self._ensure_initialized():
             return VectorStoreResult(
                 success=False,
@@ -269,6 +414,8 @@ class SimpleVectorStore:
         """Clear all documents."""
         self._documents = []
         self._vectors = None
+        self._vectors_gpu = None
+        self._hashes = {}
         self._save_data()
         return VectorStoreResult(success=True, message="Store cleared")
 
@@ -307,6 +454,7 @@ class VectorStore:
         self._backend = None
         self._backend_type = None
         self._initialized = False
+        self._last_insert_seq = 0
 
     def _ensure_initialized(self) -> bool:
         """Lazy initialization - try ChromaDB, fall back to simple store."""
@@ -325,7 +473,7 @@ class VectorStore:
             )
             collection = client.get_or_create_collection(
                 name=self.collection_name,
-                metadata={"hnsw:space": "cosine"},
+                metadata={"hnsw:space": _CHROMA_SPACE},
             )
             embedding_model = SentenceTransformer(self.embedding_model_name)
 
@@ -364,7 +512,9 @@ class VectorStore:
     def _embed(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for texts."""
         if self._backend_type == "chromadb":
-            embeddings = self._backend["embedding_model"].encode(texts, convert_to_numpy=True)
+            embeddings = self._backend["embedding_model"].encode(
+                texts, convert_to_numpy=True, normalize_embeddings=True,
+            )
             return embeddings.tolist()
         return []
 
@@ -389,29 +539,138 @@ class VectorStore:
         if not content or not content.strip():
             return VectorStoreResult(success=False, message="Cannot index empty content")
 
-        if not document_id:
-            document_id = str(uuid.uuid4())
+        try:
+            document_ids, added = self._add_chroma_documents([(content, source, metadata, document_id)])
+        except Exception as e:
+            return VectorStoreResult(success=False, message=f"Failed to index document: {e}")
 
-        doc_metadata = metadata or {}
-        doc_metadata["source"] = source
-        doc_metadata["timestamp"] = datetime.now().isoformat()
-        doc_metadata["token_estimate"] = estimate_tokens(content)
-        doc_metadata = {
-            k: str(v) if not isinstance(v, (str, int, float, bool)) else v
-            for k, v in doc_metadata.items()
-        }
+        message = "Document indexed" if added else "Duplicate content already indexed"
+        return VectorStoreResult(success=True, message=message, document_id=document_ids[0])
 
-        try:
-            embedding = self._embed([content])[0]
-            self._backend["collection"].add(
-                ids=[document_id],
-                embeddings=[embedding],
-                documents=[content],
-                metadatas=[doc_metadata],
+    def add_documents(
+        self,
+        items: Iterable[tuple[str, str, dict[str, Any] | None, str | None]],
+    ) -> VectorStoreResult:
+        """Add several documents in one batch.
+
+        Args:
+            items: (content, source, metadata, document_id) tuples. The ID may
+                be None to have one generated.
+
+        Returns:
+            VectorStoreResult with the IDs of the indexed (or already present)
+            documents in ``document_ids``
+        """
+        if not self._ensure_initialized():
+            return VectorStoreResult(
+                success=False,
+                message="Vector store not available (missing dependencies)",
+            )
+
+        items = [item for item in items if item[0] and item[0].strip()]
+        if not items:
+            return VectorStoreResult(success=True, message="Nothing to index")
+
+        if self._backend_type == "simple":
+            document_ids = []
+            for content, source, metadata, document_id in items:
+                result = self._backend.add_document(content, source, metadata, document_id)
+                if not result.success:
+                    return result
+                document_ids.append(result.document_id)
+            return VectorStoreResult(
+                success=True,
+                message=f"Indexed {len(document_ids)} documents",
+                document_ids=document_ids,
             )
-            return VectorStoreResult(success=True, message="Document indexed", document_id=document_id)
+
+        try:
+            document_ids, added = self._add_chroma_documents(items)
         except Exception as e:
-            return VectorStoreResult(success=False, message=f"Failed to index document: {e}")
+            return VectorStoreResult(success=False, message=f"Failed to index documents: {e}")
+
+        return VectorStoreResult(
+            success=True,
+            message=f"Indexed {added} documents ({len(items) - added} duplicates)",
+            document_ids=document_ids,
+        )
+
+    def _add_chroma_documents(
+        self,
+        items: list[tuple[str, str, dict[str, Any] | None, str | None]],
+    ) -> tuple[list[str], int]:
+        """Embed and add documents to ChromaDB with a single collection call.
+
+        Content that is already indexed, or repeated within the batch, is not
+        re-embedded; its existing ID is reported instead.
+
+        Returns:
+            The document ID for each item, and how many were newly added
+        """
+        collection = self._backend["collection"]
+        hashes = [_content_hash(content) for content, _, _, _ in items]
+
+        existing: dict[str, str] = {}
+        try:
+            found = collection.get(
+                where={"content_hash": {"$in": list(set(hashes))}}, include=["metadatas"],
+            )
+            for doc_id, meta in zip(found["ids"], found["metadatas"] or []):
+                existing.setdefault(meta.get("content_hash"), doc_id)
+        except Exception:
+            pass
+
+        ids, contents, metadatas, document_ids = [], [], [], []
+        for (content, source, metadata, document_id), content_hash in zip(items, hashes):
+            if content_hash in existing:
+                document_ids.append(existing[content_hash])
+                continue
+
+            document_id = document_id or str(uuid.uuid4())
+            existing[content_hash] = document_id
+            document_ids.append(document_id)
+
+            # A fresh dict per row; only caller-supplied values need coercing,
+            # the fields added below are already Chroma-compatible scalars.
+            doc_metadata = _coerce_metadata(metadata or {})
+            doc_metadata["source"] = source
+            doc_metadata["content_hash"] = content_hash
+            doc_metadata["timestamp"] = datetime.now().isoformat()
+            doc_metadata["insert_seq"] = self._next_insert_seq()
+            doc_metadata["token_estimate"] = estimate_tokens(content)
+
+            ids.append(document_id)
+            contents.append(content)
+            metadatas.append(doc_metadata)
+
+        if ids:
+            collection.add(
+                ids=ids,
+                embeddings=self._embed(contents),
+                documents=contents,
+                metadatas=metadatas,
+            )
+        return document_ids, len(ids)
+
+    def _next_insert_seq(self) -> int:
+        """Strictly increasing insertion stamp used to order recent documents.
+
+        Based on the wall clock in nanoseconds so it stays ordered across
+        processes and restarts without persisting a separate counter.
+        """
+        self._last_insert_seq = max(self._last_insert_seq + 1, time.time_ns())
+        return self._last_insert_seq
+
+    @staticmethod
+    def _recency_key(metadata: dict[str, Any]) -> int:
+        """Ordering key for get_recent, falling back to the ISO timestamp."""
+        seq = metadata.get("insert_seq")
+        if isinstance(seq, int):
+            return seq
+        try:
+            return int(datetime.fromisoformat(metadata.get("timestamp", "")).timestamp() * 1e9)
+        except (TypeError, ValueError):
+            return 0
 
     def add_tool_result(
         self,
@@ -421,25 +680,55 @@ class VectorStore:
         session_id: str = "",
     ) -> VectorStoreResult:
         """Index a tool execution result."""
-        if len(result) < 50:
+        item = self._tool_result_item(tool_name, tool_input, result, session_id)
+        if item is None:
             return VectorStoreResult(success=True, message="Result too short to index")
+        content, source, metadata, _ = item
+        return self.add_document(content=content, source=source, metadata=metadata)
+
+    def add_tool_results(
+        self,
+        results: Iterable[tuple[str, dict[str, Any], str]],
+        session_id: str = "",
+    ) -> VectorStoreResult:
+        """Index several (tool_name, tool_input, result) entries in one batch."""
+        items = [
+            item for item in (
+                self._tool_result_item(tool_name, tool_input, result, session_id)
+                for tool_name, tool_input, result in results
+            )
+            if item is not None
+        ]
+        return self.add_documents(items)
+
+    def _tool_result_item(
+        self,
+        tool_name: str,
+        tool_input: dict[str, Any],
+        result: str,
+        session_id: str,
+    ) -> tuple[str, str, dict[str, Any], None] | None:
+        """Build the document for a tool result, or None if not worth indexing."""
+        if len(result) < 50:
+            return None
 
         if len(result) > 10000:
             result = result[:10000] + "\n... (truncated)"
 
+        tool_input_json = json.dumps(tool_input, default=str)
         content = (
             f"Tool: {tool_name}\n"
-            f"Input: {json.dumps(tool_input, default=str)}\n"
+            f"Input: {tool_input_json}\n"
             f"Result:\n{result}"
         )
 
         metadata = {
             "tool_name": tool_name,
-            "tool_input": json.dumps(tool_input, default=str)[:1000],
+            "tool_input": tool_input_json[:1000],
             "session_id": session_id,
         }
 
-        return self.add_document(content=content, source="tool_result", metadata=metadata)
+        return content, "tool_result", metadata, None
 
     def add_analysis_result(
         self,
@@ -449,6 +738,28 @@ class VectorStore:
         session_id: str = "",
     ) -> VectorStoreResult:
         """Index a complete analysis result."""
+        content, source, metadata, _ = self._analysis_item(query, result, tools_used, session_id)
+        return self.add_document(content=content, source=source, metadata=metadata)
+
+    def add_analysis_results(
+        self,
+        results: Iterable[tuple[str, str, list[str] | None]],
+        session_id: str = "",
+    ) -> VectorStoreResult:
+        """Index several (query, result, tools_used) entries in one batch."""
+        return self.add_documents(
+            self._analysis_item(query, result, tools_used, session_id)
+            for query, result, tools_used in results
+        )
+
+    def _analysis_item(
+        self,
+        query: str,
+        result: str,
+        tools_used: list[str] | None,
+        session_id: str,
+    ) -> tuple[str, str, dict[str, Any], None]:
+        """Build the document for an analysis result."""
         if len(result) > 15000:
             result = result[:15000] + "\n... (truncated)"
 
@@ -462,7 +773,7 @@ class VectorStore:
             "session_id": session_id,
         }
 
-        return self.add_document(content=content, source="analysis", metadata=metadata)
+        return content, "analysis", metadata, None
 
     def search(
         self,
@@ -532,7 +843,14 @@ class VectorStore:
             return VectorStoreResult(success=False, message=f"Search failed: {e}")
 
     def get_recent(self, limit: int = 10, source_filter: str | None = None) -> VectorStoreResult:
-        """Get recent documents."""
+        """Get recent documents.
+
+        ChromaDB cannot sort on metadata, so finding the newest documents
+        scans the metadata of every candidate: O(N) rows transferred for N
+        documents (matching the source filter). Rows are fetched in pages
+        with a running top-``limit`` heap, so peak memory stays at
+        O(page + limit), and only the winners' documents are fetched.
+        """
         if not self._ensure_initialized():
             return VectorStoreResult(
                 success=False,
@@ -543,31 +861,62 @@ class VectorStore:
             # Simple store doesn't have efficient recent query, return empty
             return VectorStoreResult(success=True, message="Recent not supported", results=[])
 
+        if limit < 1:
+            return VectorStoreResult(success=True, message="Retrieved 0 recent documents", results=[])
+
         try:
+            collection = self._backend["collection"]
             where_filter = {"source": source_filter} if source_filter else None
-            results = self._backend["collection"].get(
-                limit=limit * 2,
-                where=where_filter,
-                include=["documents", "metadatas"],
-            )
 
-            items = []
-            if results["ids"]:
-                for i, doc_id in enumerate(results["ids"]):
-                    content = results["documents"][i]
-                    metadata = results["metadatas"][i] if results["metadatas"] else {}
-                    timestamp = metadata.get("timestamp", "")
-                    items.append((timestamp, RAGResult(
-                        id=doc_id,
-                        content=content,
-                        similarity=1.0,
-                        source=metadata.get("source", "unknown"),
-                        metadata=metadata,
-                        timestamp=timestamp,
-                    )))
+            # Rank on metadata only, then fetch documents for the winners.
+            # Heap entries are (recency, -scan order, id): among equal keys
+            # the earlier-scanned document wins, and the min is evicted first.
+            top: list[tuple[int, int, str]] = []
+            order = 0
+            offset = 0
+            while True:
+                page = collection.get(
+                    where=where_filter,
+                    include=["metadatas"],
+                    limit=_RECENT_PAGE_SIZE,
+                    offset=offset,
+                )
+                page_ids = page["ids"]
+                for doc_id, metadata in zip(page_ids, page["metadatas"] or [None] * len(page_ids)):
+                    entry = (self._recency_key(metadata or {}), -order, doc_id)
+                    order += 1
+                    if len(top) < limit:
+                        heapq.heappush(top, entry)
+                    else:
+                        heapq.heappushpop(top, entry)
+                if len(page_ids) < _RECENT_PAGE_SIZE:
+                    break
+                offset += _RECENT_PAGE_SIZE
+
+            if not top:
+                return VectorStoreResult(success=True, message="Retrieved 0 recent documents", results=[])
+
+            top_ids = [doc_id for _, _, doc_id in sorted(top, reverse=True)]
+
+            results = collection.get(ids=top_ids, include=["documents", "metadatas"])
+            by_id = {
+                doc_id: (results["documents"][i], results["metadatas"][i] if results["metadatas"] else {})
+                for i, doc_id in enumerate(results["ids"])
+            }
 
-            items.sort(key=lambda x: x[0], reverse=True)
-            rag_results = [item[1] for item in items[:limit]]
+            rag_results = []
+            for doc_id in top_ids:
+                if doc_id not in by_id:
+                    continue
+                content, metadata = by_id[doc_id]
+                rag_results.append(RAGResult(
+                    id=doc_id,
+                    content=content,
+                    similarity=1.0,
+                    source=metadata.get("source", "unknown"),
+                    metadata=metadata,
+                    timestamp=metadata.get("timestamp", ""),
+                ))
 
             return VectorStoreResult(
                 success=True,
@@ -610,7 +959,7 @@ class VectorStore:
             self._backend["client"].delete_collection(self.collection_name)
             self._backend["collection"] = self._backend["client"].create_collection(
                 name=self.collection_name,
-                metadata={"hnsw:space": "cosine"},
+                metadata={"hnsw:space": _CHROMA_SPACE},
             )
             return VectorStoreResult(success=True, message="Collection cleared")
         except Exception as e:
@@ -12,6 +12,7 @@ Provides machine learning and AI-powered analysis tools:
 from .pathogenicity import (
     PathogenicityPredictor,
     predict_variant_pathogenicity,
+    predict_variant_pathogenicity_json,
     get_cadd_scores,
     get_revel_scores,
     get_alphamissense_scores,
@@ -25,6 +26,7 @@ from .structure import (
 from .drug_response import (
     DrugResponsePredictor,
     predict_drug_response,
+    predict_drug_response_json,
     get_gdsc_predictions,
     get_ccle_predictions,
 )
@@ -44,6 +46,7 @@ __all__ = [
     # Pathogenicity
     "PathogenicityPredictor",
     "predict_variant_pathogenicity",
+    "predict_variant_pathogenicity_json",
     "get_cadd_scores",
     "get_revel_scores",
     "get_alphamissense_scores",
@@ -55,6 +58,7 @@ __all__ = [
     # Drug response
     "DrugResponsePredictor",
     "predict_drug_response",
+    "predict_drug_response_json",
     "get_gdsc_predictions",
     "get_ccle_predictions",
     # Cell annotation
@@ -7,9 +7,101 @@ Provides automated pipelines for identifying biomarkers:
 - Multi-omics integration
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 import json
+import os
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Matrices with at least this many elements use the fused numba kernel for
+# the two-class t-test; below it, JIT dispatch costs more than it saves.
+NUMBA_MIN_ELEMENTS = 5_000_000
+
+if NUMBA_AVAILABLE:
+    import numpy as np
+
+    @numba.njit(parallel=True, cache=True)
+    def _two_group_ttest_kernel(X, in_group1, block_size=64):
+        """Per-column group means and pooled-variance t statistics.
+
+        Columns are processed in blocks (one block per thread) and rows are
+        streamed in order, so a C-contiguous X is read sequentially.
+        """
+        n_rows, n_cols = X.shape
+        mean0 = np.zeros(n_cols)
+        mean1 = np.zeros(n_cols)
+        t_stat = np.empty(n_cols)
+
+        n1 = 0
+        for i in range(n_rows):
+            if in_group1[i]:
+                n1 += 1
+        n0 = n_rows - n1
+
+        n_blocks = (n_cols + block_size - 1) // block_size
+        for b in numba.prange(n_blocks):
+            start = b * block_size
+            stop = min(start + block_size, n_cols)
+
+            for i in range(n_rows):
+                target = mean1 if in_group1[i] else mean0
+                for j in range(start, stop):
+                    target[j] += X[i, j]
+            for j in range(start, stop):
+                mean0[j] /= n0
+                mean1[j] /= n1
+
+            ss0 = np.zeros(stop - start)
+            ss1 = np.zeros(stop - start)
+            for i in range(n_rows):
+                for j in range(start, stop):
+                    if in_group1[i]:
+                        ss1[j - start] += (X[i, j] - mean1[j]) ** 2
+                    else:
+                        ss0[j - start] += (X[i, j] - mean0[j]) ** 2
+
+            for j in range(start, stop):
+                pooled = (ss0[j - start] + ss1[j - start]) / (n0 + n1 - 2)
+                denom = np.sqrt(pooled * (1.0 / n0 + 1.0 / n1))
+                diff = mean0[j] - mean1[j]
+                if denom > 0:
+                    t_stat[j] = diff / denom
+                elif diff == 0:
+                    t_stat[j] = np.nan
+                else:
+                    t_stat[j] = np.inf if diff > 0 else -np.inf
+
+        return mean0, mean1, t_stat
+
+
+def _top_k_indices(values: Any, k: int) -> Any:
+    """Indices of the k largest values, highest first (ties by position).
+
+    Uses np.argpartition so only the selected k entries are sorted.
+    """
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    k = min(k, len(values))
+    if k <= 0:
+        return np.arange(0)
+    if k < len(values):
+        idx = np.argpartition(-values, k - 1)[:k]
+    else:
+        idx = np.arange(len(values))
+    return idx[np.lexsort((idx, -values[idx]))]
 
 
 @dataclass
@@ -89,6 +181,12 @@ class BiomarkerPanel:
             },
         }
 
+    def to_json(self) -> bytes:
+        """Serialize to JSON bytes (orjson when available)."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(self.to_dict(), default=float).encode("utf-8")
+
 
 class BiomarkerDiscovery:
     """
@@ -106,6 +204,7 @@ class BiomarkerDiscovery:
         self,
         n_features: int = 20,
         methods: list[str] | None = None,
+        n_jobs: int | None = None,
     ):
         """
         Initialize biomarker discovery.
@@ -113,9 +212,23 @@ class BiomarkerDiscovery:
         Args:
             n_features: Number of top features to select
             methods: Feature selection methods to use
+            n_jobs: Parallel jobs for random forest fitting; None picks
+                1 or -1 based on data size
         """
         self.n_features = n_features
         self.methods = methods or ["differential", "random_forest", "lasso"]
+        self.n_jobs = n_jobs
+
+    def _resolve_n_jobs(self, X: Any) -> int:
+        """Number of jobs for sklearn estimators on X.
+
+        n_jobs parallelizes over trees/folds, but on small inputs the joblib
+        worker startup costs more than the fits themselves, so those run
+        single-threaded unless the caller asked otherwise.
+        """
+        if self.n_jobs is not None:
+            return self.n_jobs
+        return -1 if X.size > 200_000 else 1
 
     def discover(
         self,
@@ -145,23 +258,22 @@ class BiomarkerDiscovery:
             feature_names = [f"Feature_{i}" for i in range(X.shape[1])]
 
         # Run each selection method
-        all_scores = {}
-
-        if "differential" in self.methods:
-            scores = self._differential_analysis(X, y, feature_names)
-            all_scores["differential"] = scores
-
-        if "random_forest" in self.methods:
-            scores = self._random_forest_importance(X, y, feature_names)
-            all_scores["random_forest"] = scores
-
-        if "lasso" in self.methods:
-            scores = self._lasso_selection(X, y, feature_names)
-            all_scores["lasso"] = scores
+        method_fns = {
+            "differential": self._differential_analysis,
+            "random_forest": self._random_forest_importance,
+            "lasso": self._lasso_selection,
+            "mutual_info": self._mutual_information,
+        }
+        tasks = [(name, fn) for name, fn in method_fns.items() if name in self.methods]
 
-        if "mutual_info" in self.methods:
-            scores = self._mutual_information(X, y, feature_names)
-            all_scores["mutual_info"] = scores
+        if len(tasks) >= 3:
+            # The methods are independent and spend most of their time in
+            # numpy/sklearn code that releases the GIL, so threads overlap them
+            with ThreadPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as executor:
+                futures = [executor.submit(fn, X, y, feature_names) for _, fn in tasks]
+                all_scores = {name: future.result() for (name, _), future in zip(tasks, futures)}
+        else:
+            all_scores = {name: fn(X, y, feature_names) for name, fn in tasks}
 
         # Aggregate scores
         biomarkers = self._aggregate_scores(all_scores, feature_names)
@@ -194,25 +306,37 @@ class BiomarkerDiscovery:
         unique_classes = np.unique(y)
 
         if len(unique_classes) == 2:
-            # Two-class comparison
-            class0_mask = y == unique_classes[0]
-            class1_mask = y == unique_classes[1]
+            # Two-class comparison, all features at once. The class mask is
+            # computed once and the group moments are reused for both the
+            # t statistic and the fold change.
+            in_group1 = y == unique_classes[1]
+            if NUMBA_AVAILABLE and X.size >= NUMBA_MIN_ELEMENTS:
+                mean0, mean1, t_stat = _two_group_ttest_kernel(
+                    np.ascontiguousarray(X, dtype=np.float64), in_group1,
+                )
+            else:
+                group0 = X[~in_group1]
+                group1 = X[in_group1]
+                n0, n1 = len(group0), len(group1)
+                mean0 = group0.mean(axis=0)
+                mean1 = group1.mean(axis=0)
 
-            for i, name in enumerate(feature_names):
-                group0 = X[class0_mask, i]
-                group1 = X[class1_mask, i]
+                # Pooled-variance t statistic per column (as scipy's ttest_ind)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    pooled = (group0.var(axis=0) * n0 + group1.var(axis=0) * n1) / (n0 + n1 - 2)
+                    t_stat = (mean0 - mean1) / np.sqrt(pooled * (1.0 / n0 + 1.0 / n1))
 
-                # T-test
-                t_stat, p_val = stats.ttest_ind(group0, group1)
+            p_vals = 2 * stats.t.sf(np.abs(t_stat), len(y) - 2)
 
-                # Fold change
-                mean0 = np.mean(group0) + 1e-10
-                mean1 = np.mean(group1) + 1e-10
-                fc = mean1 / mean0
+            # Fold change
+            fc = (mean1 + 1e-10) / (mean0 + 1e-10)
 
-                # Score combines significance and effect size
-                score = -np.log10(p_val + 1e-300) * abs(np.log2(fc))
-                scores[name] = float(score)
+            # Score combines significance and effect size; constant features
+            # give NaN p-values and score 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                score = -np.log10(p_vals + 1e-300) * np.abs(np.log2(fc))
+            score = np.nan_to_num(score, nan=0.0)
+            scores = dict(zip(feature_names, score.tolist()))
 
         return scores
 
@@ -226,7 +350,9 @@ class BiomarkerDiscovery:
         try:
             from sklearn.ensemble import RandomForestClassifier
 
-            rf = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
+            rf = RandomForestClassifier(
+                n_estimators=100, random_state=42, n_jobs=self._resolve_n_jobs(X),
+            )
             rf.fit(X, y)
 
             importances = rf.feature_importances_
@@ -245,17 +371,23 @@ class BiomarkerDiscovery:
         """LASSO-based feature selection."""
         try:
             from sklearn.linear_model import LogisticRegression
-            from sklearn.preprocessing import StandardScaler
             import numpy as np
 
-            # Standardize
-            scaler = StandardScaler()
-            X_scaled = scaler.fit_transform(X)
-
-            # LASSO logistic regression
+            # Standardize (as StandardScaler: population std, constant
+            # columns left unscaled) without going through the transformer
+            X_scaled = np.array(X, dtype=float)
+            mean = X_scaled.mean(axis=0)
+            std = X_scaled.std(axis=0)
+            std[std == 0] = 1.0
+            X_scaled -= mean
+            X_scaled /= std
+
+            # LASSO logistic regression; liblinear is much faster than saga
+            # for L1 on dense binary problems, saga handles multi-class
+            binary = len(np.unique(y)) == 2
             lasso = LogisticRegression(
                 penalty="l1",
-                solver="saga",
+                solver="liblinear" if binary else "saga",
                 C=0.1,
                 random_state=42,
                 max_iter=1000,
@@ -291,45 +423,51 @@ class BiomarkerDiscovery:
         method: str,
     ) -> dict[str, float]:
         """Simulate feature importance for testing."""
-        import hashlib
+        import zlib
+        import numpy as np
 
-        scores = {}
-        for name in feature_names:
-            hash_val = int(hashlib.md5(f"{method}{name}".encode()).hexdigest(), 16)
-            scores[name] = (hash_val % 1000) / 1000
-        return scores
+        # Deterministic for a given method and feature set
+        seed = zlib.crc32(method.encode()) ^ zlib.crc32("\0".join(feature_names).encode())
+        rng = np.random.default_rng(seed)
+        return dict(zip(feature_names, rng.random(len(feature_names)).tolist()))
 
     def _aggregate_scores(
         self,
         all_scores: dict[str, dict[str, float]],
         feature_names: list[str],
     ) -> list[Biomarker]:
-        """Aggregate scores from multiple methods."""
+        """Aggregate scores from multiple methods into the top n_features biomarkers."""
         import numpy as np
 
-        # Normalize scores to 0-1 range per method
-        normalized = {}
-        for method, scores in all_scores.items():
-            max_score = max(scores.values()) if scores else 1
-            min_score = min(scores.values()) if scores else 0
-            range_score = max_score - min_score + 1e-10
-
-            normalized[method] = {
-                name: (score - min_score) / range_score
-                for name, score in scores.items()
-            }
-
-        # Aggregate
-        aggregated = {}
-        for name in feature_names:
-            method_scores = [
-                normalized[method].get(name, 0)
-                for method in normalized
-            ]
-            aggregated[name] = np.mean(method_scores)
-
-        # Sort and create biomarkers
-        sorted_features = sorted(aggregated.items(), key=lambda x: x[1], reverse=True)
+        single = next(iter(all_scores.values())) if len(all_scores) == 1 else None
+        if single and list(single) == list(feature_names):
+            # One method scoring every feature in order: the ensemble is just
+            # that method's min-max normalized scores
+            values = np.fromiter(single.values(), dtype=float, count=len(single))
+            aggregated = (values - values.min()) / (np.ptp(values) + 1e-10)
+        else:
+            # (methods x features) score matrix; features a method did not score
+            # are NaN so they don't affect that method's min/max
+            index = {name: i for i, name in enumerate(feature_names)}
+            matrix = np.full((len(all_scores), len(feature_names)), np.nan)
+            for m, scores in enumerate(all_scores.values()):
+                for name, score in scores.items():
+                    if name in index:
+                        matrix[m, index[name]] = score
+
+            # Normalize scores to 0-1 range per method, then average
+            if matrix.size:
+                with np.errstate(all="ignore"):
+                    min_score = np.nanmin(matrix, axis=1, keepdims=True)
+                    max_score = np.nanmax(matrix, axis=1, keepdims=True)
+                matrix = (matrix - min_score) / (max_score - min_score + 1e-10)
+                aggregated = np.nan_to_num(matrix, nan=0.0).mean(axis=0)
+            else:
+                aggregated = np.zeros(len(feature_names))
+
+        # Rank and create biomarkers for the top n_features only
+        order = _top_k_indices(aggregated, self.n_features)
+        sorted_features = [(feature_names[i], float(aggregated[i])) for i in order]
 
         biomarkers = []
         for rank, (name, score) in enumerate(sorted_features, 1):
@@ -367,15 +505,20 @@ class BiomarkerDiscovery:
             # For simplicity, use top N columns
             X_selected = X[:, :len(feature_names)]
 
-            # Cross-validated predictions
-            clf = RandomForestClassifier(n_estimators=50, random_state=42)
-            y_pred = cross_val_predict(clf, X_selected, y, cv=5)
-
             # Metrics
             unique_classes = np.unique(y)
             if len(unique_classes) == 2:
-                y_prob = cross_val_predict(clf, X_selected, y, cv=5, method="predict_proba")[:, 1]
-                auc = roc_auc_score(y, y_prob)
+                # One cross-validation pass: labels are derived from the
+                # probabilities (columns follow the sorted class order).
+                # Any parallelism (n_jobs) is across folds; each forest
+                # itself is fit single-threaded.
+                clf = RandomForestClassifier(n_estimators=50, random_state=42)
+                y_prob = cross_val_predict(
+                    clf, X_selected, y, cv=5, method="predict_proba",
+                    n_jobs=self._resolve_n_jobs(X_selected),
+                )
+                y_pred = unique_classes[y_prob.argmax(axis=1)]
+                auc = roc_auc_score(y, y_prob[:, 1])
                 sens = recall_score(y, y_pred, pos_label=unique_classes[1])
                 spec = recall_score(y, y_pred, pos_label=unique_classes[0])
             else:
@@ -387,12 +530,12 @@ class BiomarkerDiscovery:
 
         except ImportError:
             # Simulate
-            import hashlib
-            hash_val = int(hashlib.md5(str(len(biomarkers)).encode()).hexdigest(), 16)
-            auc = 0.70 + (hash_val % 250) / 1000
-            sens = 0.65 + (hash_val % 300) / 1000
-            spec = 0.65 + (hash_val % 300) / 1000
-            return auc, sens, spec
+            import numpy as np
+            rng = np.random.default_rng(len(biomarkers))
+            auc = rng.uniform(0.70, 0.95)
+            sens = rng.uniform(0.65, 0.95)
+            spec = rng.uniform(0.65, 0.95)
+            return float(auc), float(sens), float(spec)
 
 
 def discover_biomarkers(
@@ -461,10 +604,12 @@ def run_feature_selection(
     else:
         raise ValueError(f"Unknown method: {method}")
 
-    # Sort and return top features
-    sorted_features = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    # Select and return top features
+    names = list(scores)
+    values = np.fromiter(scores.values(), dtype=float, count=len(names))
+    top = _top_k_indices(values, n_features)
 
     return [
-        {"feature": name, "importance": round(score, 4), "rank": i + 1}
-        for i, (name, score) in enumerate(sorted_features[:n_features])
+        {"feature": names[j], "importance": round(float(values[j]), 4), "rank": i + 1}
+        for i, j in enumerate(top)
     ]
@@ -6,13 +6,42 @@ Integrates cell type annotation tools:
 - scType (marker-based annotation)
 """
 
+from collections import Counter
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 import json
 
-
-@dataclass
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Specific -> broad cell type categories (read-only)
+_BROAD_MAPPING = MappingProxyType({
+    "CD4+ T cell": "T cell",
+    "CD8+ T cell": "T cell",
+    "Regulatory T cell": "T cell",
+    "Naive T cell": "T cell",
+    "Memory T cell": "T cell",
+    "B cell": "B cell",
+    "Plasma cell": "B cell",
+    "Memory B cell": "B cell",
+    "NK cell": "Lymphocyte",
+    "Monocyte": "Myeloid",
+    "Macrophage": "Myeloid",
+    "Dendritic cell": "Myeloid",
+    "Neutrophil": "Myeloid",
+    "Epithelial": "Epithelial",
+    "Fibroblast": "Stromal",
+    "Endothelial": "Endothelial",
+})
+
+
+@dataclass(slots=True)
 class CellTypeAnnotation:
     """Cell type annotation result."""
 
@@ -48,7 +77,7 @@ class CellTypeAnnotation:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AnnotationSummary:
     """Summary of cell type annotations for a dataset."""
 
@@ -67,6 +96,10 @@ class AnnotationSummary:
     method: str = ""
     model: str = ""
 
+    # Per-cell columns (numpy arrays aligned with annotations)
+    confidences: Any = None
+    predicted_types: Any = None
+
     def to_dict(self) -> dict:
         return {
             "summary": {
@@ -81,6 +114,27 @@ class AnnotationSummary:
             "model": self.model,
         }
 
+    def to_json(self, include_cells: bool = False) -> bytes:
+        """Serialize to JSON bytes (orjson when available).
+
+        Args:
+            include_cells: Also emit the per-cell confidence and predicted
+                type columns, encoded straight from the numpy arrays rather
+                than via one dict per cell
+        """
+        data = self.to_dict()
+        if include_cells and self.confidences is not None:
+            data["cells"] = {
+                "confidence": self.confidences,
+                "predicted_type": list(self.predicted_types),
+            }
+
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+        if "cells" in data:
+            data["cells"]["confidence"] = data["cells"]["confidence"].tolist()
+        return json.dumps(data).encode("utf-8")
+
 
 class CellTypeAnnotator:
     """
@@ -112,6 +166,9 @@ class CellTypeAnnotator:
         "Smooth muscle": ["ACTA2", "TAGLN", "MYH11"],
     }
 
+    # Loaded CellTypist models shared across instances, keyed by model name
+    _MODEL_CACHE: dict[str, Any] = {}
+
     def __init__(self, model: str = "Immune_All_Low.pkl"):
         """
         Initialize annotator.
@@ -121,6 +178,7 @@ class CellTypeAnnotator:
         """
         self.model = model
         self._celltypist_model = None
+        self._marker_weights_cache: tuple[tuple[str, ...], Any] | None = None
 
     def annotate(
         self,
@@ -128,6 +186,8 @@ class CellTypeAnnotator:
         method: str = "celltypist",
         tissue: str | None = None,
         gene_symbols: list[str] | None = None,
+        return_per_cell: bool = True,
+        majority_voting: bool = False,
     ) -> AnnotationSummary:
         """
         Annotate cell types.
@@ -137,14 +197,22 @@ class CellTypeAnnotator:
             method: Annotation method (celltypist, sctype)
             tissue: Tissue type for scType
             gene_symbols: Gene names if not in expression_data
+            return_per_cell: Build a CellTypeAnnotation per cell. When False,
+                only the summary and per-cell array columns are filled and
+                ``annotations`` is empty.
+            majority_voting: Refine CellTypist labels by over-clustering and
+                majority voting. Off by default; it adds a clustering and
+                kNN step that is often slower than the prediction itself.
 
         Returns:
             AnnotationSummary with cell type predictions
         """
         if method == "celltypist":
-            return self._run_celltypist(expression_data, gene_symbols)
+            return self._run_celltypist(
+                expression_data, gene_symbols, return_per_cell, majority_voting,
+            )
         elif method == "sctype":
-            return self._run_sctype(expression_data, tissue, gene_symbols)
+            return self._run_sctype(expression_data, tissue, gene_symbols, return_per_cell)
         else:
             raise ValueError(f"Unknown method: {method}")
 
@@ -152,35 +220,57 @@ class CellTypeAnnotator:
         self,
         expression_data: Any,
         gene_symbols: list[str] | None,
+        return_per_cell: bool = True,
+        majority_voting: bool = False,
     ) -> AnnotationSummary:
         """Run CellTypist annotation."""
         try:
             import celltypist
+            import numpy as np
             from celltypist import models
 
-            # Load model
-            model = models.Model.load(model=self.model)
+            # Load model (cached; model pickles are large and slow to read)
+            model = self._MODEL_CACHE.get(self.model)
+            if model is None:
+                model = models.Model.load(model=self.model)
+                self._MODEL_CACHE[self.model] = model
 
             # Run prediction
             predictions = celltypist.annotate(
                 expression_data,
                 model=model,
-                majority_voting=True,
+                majority_voting=majority_voting,
             )
 
             # Extract results
+            labels = predictions.predicted_labels
+            if hasattr(labels, "columns"):
+                labels = labels.iloc[:, -1]  # majority_voting column when present
+            predicted_types = labels.to_numpy(dtype=object)
+            confidences = predictions.probability_matrix.max(axis=1).to_numpy(dtype=float)
+            type_counts = dict(Counter(predicted_types.tolist()))
+
             annotations = []
-            type_counts = {}
+            if return_per_cell:
+                # Top-3 types per cell for all cells at once
+                prob_matrix = predictions.probability_matrix.to_numpy(dtype=float)
+                type_names = predictions.probability_matrix.columns.tolist()
+                k = min(3, prob_matrix.shape[1])
+                top = np.argpartition(-prob_matrix, k - 1, axis=1)[:, :k]
+                top_probs = np.take_along_axis(prob_matrix, top, axis=1)
+                order = np.argsort(-top_probs, axis=1, kind="stable")
+                top = np.take_along_axis(top, order, axis=1).tolist()
+                top_probs = np.take_along_axis(top_probs, order, axis=1).tolist()
+                cells = zip(labels.index, predicted_types, confidences)
+            else:
+                cells = ()
 
-            for i, (cell_id, pred_type, prob) in enumerate(zip(
-                predictions.predicted_labels.index,
-                predictions.predicted_labels.values,
-                predictions.probability_matrix.max(axis=1),
-            )):
+            for i, (cell_id, pred_type, prob) in enumerate(cells):
                 # Get alternative predictions
-                probs = predictions.probability_matrix.iloc[i]
-                top_types = probs.nlargest(3)
-                alternatives = [(t, float(s)) for t, s in top_types.items() if t != pred_type]
+                alternatives = [
+                    (type_names[t], s) for t, s in zip(top[i], top_probs[i])
+                    if type_names[t] != pred_type
+                ]
 
                 ann = CellTypeAnnotation(
                     cell_id=str(cell_id),
@@ -192,34 +282,43 @@ class CellTypeAnnotator:
                 )
                 annotations.append(ann)
 
-                type_counts[pred_type] = type_counts.get(pred_type, 0) + 1
-
-            return self._create_summary(annotations, type_counts, "celltypist", self.model)
+            return self._create_summary(
+                annotations, type_counts, "celltypist", self.model,
+                confidences=confidences, predicted_types=predicted_types,
+            )
 
         except ImportError:
             # Simulate for testing
-            return self._simulate_annotation(expression_data, gene_symbols, "celltypist")
+            return self._simulate_annotation(
+                expression_data, gene_symbols, "celltypist", return_per_cell,
+            )
 
     def _run_sctype(
         self,
         expression_data: Any,
         tissue: str | None,
         gene_symbols: list[str] | None,
+        return_per_cell: bool = True,
     ) -> AnnotationSummary:
         """Run scType annotation."""
         try:
             # scType is R-based, would need rpy2
             # For now, use marker-based approach
-            return self._marker_based_annotation(expression_data, tissue, gene_symbols)
+            return self._marker_based_annotation(
+                expression_data, tissue, gene_symbols, return_per_cell,
+            )
 
         except Exception:
-            return self._simulate_annotation(expression_data, gene_symbols, "sctype")
+            return self._simulate_annotation(
+                expression_data, gene_symbols, "sctype", return_per_cell,
+            )
 
     def _marker_based_annotation(
         self,
         expression_data: Any,
         tissue: str | None,
         gene_symbols: list[str] | None,
+        return_per_cell: bool = True,
     ) -> AnnotationSummary:
         """Simple marker-based annotation."""
         import numpy as np
@@ -237,54 +336,100 @@ class CellTypeAnnotator:
             n_cells = matrix.shape[0]
 
         # Score each cell type
-        markers = {**self.IMMUNE_MARKERS, **self.TISSUE_MARKERS}
+        type_list, weights, present_markers = self._marker_weights(genes)
+
+        if type_list:
+            scores = np.asarray(matrix @ weights.T, dtype=float)
+            top = np.argsort(-scores, axis=1, kind="stable")[:, :4]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            predicted_types = np.array(type_list, dtype=object)[top[:, 0]]
+            confidences = np.minimum(top_scores[:, 0] / 5, 1.0)  # Normalize
+        else:
+            top = top_scores = np.empty((n_cells, 0))
+            predicted_types = np.full(n_cells, "Unknown", dtype=object)
+            confidences = np.zeros(n_cells)
+        type_counts = dict(Counter(predicted_types.tolist()))
 
         annotations = []
-        type_counts = {}
-
-        for i in range(n_cells):
-            cell_expr = matrix[i] if hasattr(matrix, "__getitem__") else matrix
-
-            scores = {}
-            for cell_type, type_markers in markers.items():
-                marker_indices = [genes.index(m) for m in type_markers if m in genes]
-                if marker_indices:
-                    scores[cell_type] = float(np.mean([cell_expr[j] for j in marker_indices]))
-
-            if scores:
-                sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-                pred_type = sorted_scores[0][0]
-                confidence = min(sorted_scores[0][1] / 5, 1.0)  # Normalize
-                alternatives = [(t, s / 5) for t, s in sorted_scores[1:4]]
-            else:
-                pred_type = "Unknown"
-                confidence = 0.0
-                alternatives = []
-
-            ann = CellTypeAnnotation(
-                cell_id=f"cell_{i}",
-                predicted_type=pred_type,
-                confidence=confidence,
-                alternative_types=alternatives,
-                broad_type=self._get_broad_type(pred_type),
-                marker_genes=[m for m in markers.get(pred_type, []) if m in genes][:5],
-                method="sctype",
-            )
-            annotations.append(ann)
+        if return_per_cell:
+            pred_list = predicted_types.tolist()
+            conf_list = confidences.tolist()
+            alt_idx = top[:, 1:].astype(int).tolist()
+            alt_scores = (top_scores[:, 1:] / 5).tolist()
+
+            for i in range(n_cells):
+                pred_type = pred_list[i]
+                ann = CellTypeAnnotation(
+                    cell_id=f"cell_{i}",
+                    predicted_type=pred_type,
+                    confidence=conf_list[i],
+                    alternative_types=[
+                        (type_list[t], s) for t, s in zip(alt_idx[i], alt_scores[i])
+                    ],
+                    broad_type=self._get_broad_type(pred_type),
+                    marker_genes=present_markers.get(pred_type, []),
+                    method="sctype",
+                )
+                annotations.append(ann)
+
+        return self._create_summary(
+            annotations, type_counts, "sctype", "marker_based",
+            confidences=confidences, predicted_types=predicted_types,
+        )
+
+    def _marker_weights(
+        self,
+        genes: list[str],
+    ) -> tuple[list[str], Any, dict[str, list[str]]]:
+        """Build the marker weight matrix for a gene list.
+
+        Returns the scored cell types, a (types x genes) matrix whose rows
+        average each type's markers present in ``genes``, and the present
+        marker genes per type. The result for the most recent gene list is
+        cached, so repeated annotation of the same dataset skips the setup.
+        """
+        import numpy as np
+
+        key = tuple(genes)
+        if self._marker_weights_cache is not None and self._marker_weights_cache[0] == key:
+            return self._marker_weights_cache[1]
+
+        markers = {**self.IMMUNE_MARKERS, **self.TISSUE_MARKERS}
 
-            type_counts[pred_type] = type_counts.get(pred_type, 0) + 1
+        gene_pos: dict[str, int] = {}
+        for j, gene in enumerate(genes):
+            gene_pos.setdefault(gene, j)
+
+        type_list = []
+        type_indices = []
+        for cell_type, type_markers in markers.items():
+            marker_indices = [gene_pos[m] for m in type_markers if m in gene_pos]
+            if marker_indices:
+                type_list.append(cell_type)
+                type_indices.append(marker_indices)
+
+        weights = np.zeros((len(type_list), len(genes)))
+        for t, marker_indices in enumerate(type_indices):
+            np.add.at(weights[t], marker_indices, 1.0 / len(marker_indices))
+
+        present_markers = {
+            cell_type: [m for m in type_markers if m in gene_pos][:5]
+            for cell_type, type_markers in markers.items()
+        }
 
-        return self._create_summary(annotations, type_counts, "sctype", "marker_based")
+        result = (type_list, weights, present_markers)
+        self._marker_weights_cache = (key, result)
+        return result
 
     def _simulate_annotation(
         self,
         expression_data: Any,
         gene_symbols: list[str] | None,
         method: str,
+        return_per_cell: bool = True,
     ) -> AnnotationSummary:
         """Simulate cell type annotation for testing."""
-        import hashlib
-        import random
+        import numpy as np
 
         # Determine number of cells
         if hasattr(expression_data, "shape"):
@@ -307,43 +452,51 @@ class CellTypeAnnotator:
             ("Unknown", 0.07),
         ]
 
+        rng = np.random.default_rng()
+        type_names = [ct for ct, _ in cell_types]
+        cumulative = np.cumsum([prop for _, prop in cell_types])
+
+        # Select cell types based on distribution
+        type_idx = np.searchsorted(cumulative, rng.random(n_cells))
+        type_idx = np.minimum(type_idx, len(cell_types) - 1)
+        predicted_types = np.array(type_names, dtype=object)[type_idx]
+        type_idx = type_idx.tolist()
+
+        # Generate confidences
+        confidence_array = np.round(0.6 + rng.random(n_cells) * 0.35, 3)
+        type_counts = dict(Counter(predicted_types.tolist()))
+
         annotations = []
-        type_counts = {}
-
-        for i in range(n_cells):
-            # Select cell type based on distribution
-            r = random.random()
-            cumsum = 0
-            pred_type = "Unknown"
-            for ct, prop in cell_types:
-                cumsum += prop
-                if r <= cumsum:
-                    pred_type = ct
-                    break
-
-            # Generate confidence
-            confidence = round(0.6 + random.random() * 0.35, 3)
-
-            # Generate alternatives
-            alternatives = []
-            for ct, _ in random.sample(cell_types, min(3, len(cell_types))):
-                if ct != pred_type:
-                    alternatives.append((ct, round(random.random() * 0.5, 3)))
-
-            ann = CellTypeAnnotation(
-                cell_id=f"cell_{i}",
-                predicted_type=pred_type,
-                confidence=confidence,
-                alternative_types=alternatives[:2],
-                broad_type=self._get_broad_type(pred_type),
-                marker_genes=self.IMMUNE_MARKERS.get(pred_type, [])[:3],
-                method=method,
-            )
-            annotations.append(ann)
+        if return_per_cell:
+            confidences = confidence_array.tolist()
 
-            type_counts[pred_type] = type_counts.get(pred_type, 0) + 1
+            # Generate alternatives: 3 distinct types per cell, minus the prediction
+            alt_idx = rng.random((n_cells, len(cell_types))).argsort(axis=1)[:, :3].tolist()
+            alt_scores = np.round(rng.random((n_cells, 3)) * 0.5, 3).tolist()
 
-        return self._create_summary(annotations, type_counts, method, "simulated")
+            for i in range(n_cells):
+                pred_type = type_names[type_idx[i]]
+                alternatives = [
+                    (type_names[t], score)
+                    for t, score in zip(alt_idx[i], alt_scores[i])
+                    if t != type_idx[i]
+                ]
+
+                ann = CellTypeAnnotation(
+                    cell_id=f"cell_{i}",
+                    predicted_type=pred_type,
+                    confidence=confidences[i],
+                    alternative_types=alternatives[:2],
+                    broad_type=self._get_broad_type(pred_type),
+                    marker_genes=self.IMMUNE_MARKERS.get(pred_type, [])[:3],
+                    method=method,
+                )
+                annotations.append(ann)
+
+        return self._create_summary(
+            annotations, type_counts, method, "simulated",
+            confidences=confidence_array, predicted_types=predicted_types,
+        )
 
     def _create_summary(
         self,
@@ -351,17 +504,34 @@ class CellTypeAnnotator:
         type_counts: dict[str, int],
         method: str,
         model: str,
+        confidences: Any = None,
+        predicted_types: Any = None,
     ) -> AnnotationSummary:
-        """Create annotation summary."""
-        total_cells = len(annotations)
+        """Create annotation summary.
+
+        Per-cell confidences and predicted types are kept as numpy arrays;
+        callers that already have them can pass them to skip the extraction.
+        """
+        import numpy as np
+
+        if confidences is None:
+            confidences = np.fromiter(
+                (a.confidence for a in annotations), dtype=float, count=len(annotations),
+            )
+        else:
+            confidences = np.asarray(confidences, dtype=float)
+        if predicted_types is None:
+            predicted_types = np.array([a.predicted_type for a in annotations], dtype=object)
+        else:
+            predicted_types = np.asarray(predicted_types, dtype=object)
+        total_cells = len(confidences)
 
         # Calculate proportions
         type_proportions = {k: v / total_cells for k, v in type_counts.items()}
 
         # Quality metrics
-        confidences = [a.confidence for a in annotations]
-        mean_confidence = sum(confidences) / len(confidences) if confidences else 0
-        low_confidence = sum(1 for c in confidences if c < 0.5)
+        mean_confidence = float(confidences.mean()) if total_cells else 0
+        low_confidence = int((confidences < 0.5).sum())
 
         return AnnotationSummary(
             total_cells=total_cells,
@@ -373,29 +543,20 @@ class CellTypeAnnotator:
             low_confidence_cells=low_confidence,
             method=method,
             model=model,
+            confidences=confidences,
+            predicted_types=predicted_types,
         )
 
-    def _get_broad_type(self, specific_type: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _get_broad_type(specific_type: str) -> str:
         """Get broad cell type category."""
-        broad_mapping = {
-            "CD4+ T cell": "T cell",
-            "CD8+ T cell": "T cell",
-            "Regulatory T cell": "T cell",
-            "Naive T cell": "T cell",
-            "Memory T cell": "T cell",
-            "B cell": "B cell",
-            "Plasma cell": "B cell",
-            "Memory B cell": "B cell",
-            "NK cell": "Lymphocyte",
-            "Monocyte": "Myeloid",
-            "Macrophage": "Myeloid",
-            "Dendritic cell": "Myeloid",
-            "Neutrophil": "Myeloid",
-            "Epithelial": "Epithelial",
-            "Fibroblast": "Stromal",
-            "Endothelial": "Endothelial",
-        }
-        return broad_mapping.get(specific_type, specific_type)
+        return _BROAD_MAPPING.get(specific_type, specific_type)
+
+    @classmethod
+    def clear_model_cache(cls) -> None:
+        """Release all cached CellTypist models."""
+        cls._MODEL_CACHE.clear()
 
     @classmethod
     def available_models(cls) -> list[str]:
@@ -430,7 +591,10 @@ def annotate_cell_types(
         Annotation summary with cell type predictions
     """
     annotator = CellTypeAnnotator(model=model)
-    result = annotator.annotate(expression_data, method=method, tissue=tissue)
+    # to_dict() only reports the summary, so skip per-cell objects
+    result = annotator.annotate(
+        expression_data, method=method, tissue=tissue, return_per_cell=False,
+    )
     return result.to_dict()
 
 
@@ -7,11 +7,82 @@ Integrates pharmacogenomics databases and models:
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
 from typing import Any
+import hashlib
 import json
+import re
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+
+@lru_cache(maxsize=8192)
+def _key_hash(key: str) -> int:
+    """Deterministic 64-bit digest used by the simulation fallbacks.
+
+    Only needs to be stable, not cryptographic, so an 8-byte BLAKE2b is used.
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+# Cell line name fragments that identify a tissue, in priority order
+_TISSUE_HINTS: MappingProxyType[str, tuple[str, ...]] = MappingProxyType({
+    "lung": ("A549", "H1299", "H460", "PC9", "HCC"),
+    "breast": ("MCF", "MDA", "T47D", "BT474", "SKBR"),
+    "colon": ("HCT", "HT29", "SW480", "COLO", "DLD"),
+    "melanoma": ("A375", "SKMEL", "MEWO", "WM"),
+    "leukemia": ("K562", "HL60", "MOLM", "KASUMI"),
+})
+
+# Ordered (tissue, hint pattern) pairs; the first tissue whose pattern
+# matches anywhere in the upper-cased cell line name wins.
+_TISSUE_PATTERNS = tuple(
+    (tissue, re.compile("|".join(hints))) for tissue, hints in _TISSUE_HINTS.items()
+)
+
+
+# Simulated GDSC panel: representative cell lines per tissue
+_CELL_LINES_BY_TISSUE: MappingProxyType[str, tuple[str, ...]] = MappingProxyType({
+    "lung": ("A549", "H1299", "H460", "PC9", "HCC827"),
+    "breast": ("MCF7", "MDA-MB-231", "T47D", "BT474", "SKBR3"),
+    "colon": ("HCT116", "HT29", "SW480", "COLO205", "DLD1"),
+    "melanoma": ("A375", "SKMEL28", "MEWO", "WM266", "A2058"),
+    "leukemia": ("K562", "HL60", "MOLM13", "KASUMI1", "MV411"),
+})
+
+
+# Shared HTTP session (keep-alive, connection pooling, retries on transient
+# gateway errors). Created on first use so requests stays optional.
+_SESSION = None
+
+
+def _get_session():
+    """Return the module-wide requests.Session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+@dataclass(slots=True)
 class DrugResponsePrediction:
     """Drug response prediction for a cell line or sample."""
 
@@ -40,28 +111,44 @@ class DrugResponsePrediction:
     source: str | None = None  # GDSC, CCLE
     n_cell_lines: int | None = None
 
+    # Reads every serialized field in one C-level call (not a dataclass field)
+    _FIELDS = attrgetter(
+        "drug_name", "drug_id", "drug_targets", "pathway", "drug_class",
+        "cell_line", "tissue",
+        "ic50", "ic50_unit", "auc", "ln_ic50",
+        "predicted_response", "confidence", "z_score",
+        "source", "n_cell_lines",
+    )
+
     def to_dict(self) -> dict:
+        (
+            name, drug_id, targets, pathway, drug_class,
+            cell_line, tissue,
+            ic50, ic50_unit, auc, ln_ic50,
+            prediction, confidence, z_score,
+            source, n_cell_lines,
+        ) = self._FIELDS(self)
         return {
             "drug": {
-                "name": self.drug_name,
-                "id": self.drug_id,
-                "targets": self.drug_targets,
-                "pathway": self.pathway,
-                "class": self.drug_class,
+                "name": name,
+                "id": drug_id,
+                "targets": targets,
+                "pathway": pathway,
+                "class": drug_class,
             },
-            "cell_line": self.cell_line,
-            "tissue": self.tissue,
+            "cell_line": cell_line,
+            "tissue": tissue,
             "response": {
-                "ic50": self.ic50,
-                "ic50_unit": self.ic50_unit,
-                "auc": self.auc,
-                "ln_ic50": self.ln_ic50,
-                "prediction": self.predicted_response,
-                "confidence": self.confidence,
-                "z_score": self.z_score,
+                "ic50": ic50,
+                "ic50_unit": ic50_unit,
+                "auc": auc,
+                "ln_ic50": ln_ic50,
+                "prediction": prediction,
+                "confidence": confidence,
+                "z_score": z_score,
             },
-            "source": self.source,
-            "n_cell_lines": self.n_cell_lines,
+            "source": source,
+            "n_cell_lines": n_cell_lines,
         }
 
 
@@ -76,7 +163,7 @@ class DrugResponsePredictor:
     CCLE_API = "https://depmap.org/portal/api"
 
     # Common drug-target mappings
-    DRUG_TARGETS = {
+    DRUG_TARGETS = MappingProxyType({
         "Erlotinib": ["EGFR"],
         "Gefitinib": ["EGFR"],
         "Lapatinib": ["EGFR", "ERBB2"],
@@ -92,9 +179,9 @@ class DrugResponsePredictor:
         "Cisplatin": ["DNA"],
         "Doxorubicin": ["TOP2A"],
         "5-Fluorouracil": ["TYMS"],
-    }
+    })
 
-    DRUG_PATHWAYS = {
+    DRUG_PATHWAYS = MappingProxyType({
         "Erlotinib": "EGFR signaling",
         "Gefitinib": "EGFR signaling",
         "Lapatinib": "EGFR/ERBB2 signaling",
@@ -110,7 +197,7 @@ class DrugResponsePredictor:
         "Cisplatin": "DNA damage",
         "Doxorubicin": "DNA damage",
         "5-Fluorouracil": "Nucleotide metabolism",
-    }
+    })
 
     def __init__(self):
         self._gdsc_data = None
@@ -161,13 +248,13 @@ class DrugResponsePredictor:
     ) -> list[DrugResponsePrediction]:
         """Get drug response data from GDSC."""
         try:
-            import requests
+            session = _get_session()
 
             # GDSC API query
             url = f"{self.GDSC_API}/compounds"
             params = {"search": drug}
 
-            response = requests.get(url, params=params, timeout=30)
+            response = session.get(url, params=params, timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -188,29 +275,21 @@ class DrugResponsePredictor:
         tissue: str | None,
     ) -> list[DrugResponsePrediction]:
         """Simulate GDSC response data."""
-        import hashlib
-
         results = []
 
-        # Simulated cell lines by tissue
-        cell_lines_by_tissue = {
-            "lung": ["A549", "H1299", "H460", "PC9", "HCC827"],
-            "breast": ["MCF7", "MDA-MB-231", "T47D", "BT474", "SKBR3"],
-            "colon": ["HCT116", "HT29", "SW480", "COLO205", "DLD1"],
-            "melanoma": ["A375", "SKMEL28", "MEWO", "WM266", "A2058"],
-            "leukemia": ["K562", "HL60", "MOLM13", "KASUMI1", "MV411"],
-        }
-
         if cell_line:
-            cell_lines = [cell_line]
+            cell_lines = (cell_line,)
         elif tissue:
-            cell_lines = cell_lines_by_tissue.get(tissue.lower(), ["Unknown"])
+            cell_lines = _CELL_LINES_BY_TISSUE.get(tissue.lower(), ("Unknown",))
         else:
             # Return summary across tissues
-            cell_lines = ["Pan-cancer"]
+            cell_lines = ("Pan-cancer",)
+
+        # Drug annotations are the same for every simulated cell line
+        targets, pathway = _DRUG_INFO.get(drug.upper(), _NO_DRUG_INFO)
 
         for cl in cell_lines[:5]:  # Limit to 5
-            hash_val = int(hashlib.md5(f"{drug}{cl}".encode()).hexdigest(), 16)
+            hash_val = _key_hash(f"{drug}{cl}")
 
             # Generate IC50 based on drug-cell line combination
             base_ic50 = 0.1 + (hash_val % 1000) / 100  # 0.1 - 10 uM
@@ -234,8 +313,8 @@ class DrugResponsePredictor:
                 auc=round(0.3 + (hash_val % 600) / 1000, 3),
                 predicted_response=response,
                 confidence=round(0.7 + (hash_val % 300) / 1000, 2),
-                drug_targets=self.DRUG_TARGETS.get(drug, []),
-                pathway=self.DRUG_PATHWAYS.get(drug),
+                drug_targets=list(targets),
+                pathway=pathway,
                 source="GDSC",
                 n_cell_lines=100 + (hash_val % 900),
             ))
@@ -250,13 +329,13 @@ class DrugResponsePredictor:
     ) -> list[DrugResponsePrediction]:
         """Get drug response data from CCLE/DepMap."""
         try:
-            import requests
+            session = _get_session()
 
             # DepMap API query
             url = f"{self.CCLE_API}/drug"
             params = {"name": drug}
 
-            response = requests.get(url, params=params, timeout=30)
+            response = session.get(url, params=params, timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -275,14 +354,13 @@ class DrugResponsePredictor:
         tissue: str | None,
     ) -> list[DrugResponsePrediction]:
         """Simulate CCLE response data."""
-        import hashlib
-
         # CCLE provides complementary data to GDSC
         # Only return if specific cell line requested
         if not cell_line:
             return []
 
-        hash_val = int(hashlib.md5(f"ccle{drug}{cell_line}".encode()).hexdigest(), 16)
+        hash_val = _key_hash(f"ccle{drug}{cell_line}")
+        targets, pathway = _DRUG_INFO.get(drug.upper(), _NO_DRUG_INFO)
 
         auc = round(0.2 + (hash_val % 800) / 1000, 3)
 
@@ -301,8 +379,8 @@ class DrugResponsePredictor:
             auc=auc,
             predicted_response=response,
             confidence=round(0.65 + (hash_val % 300) / 1000, 2),
-            drug_targets=self.DRUG_TARGETS.get(drug, []),
-            pathway=self.DRUG_PATHWAYS.get(drug),
+            drug_targets=list(targets),
+            pathway=pathway,
             source="CCLE",
         )]
 
@@ -313,62 +391,35 @@ class DrugResponsePredictor:
     ) -> DrugResponsePrediction | None:
         """Predict response from genomic features."""
         # Simple rule-based prediction based on known biomarkers
-        prediction = None
-        confidence = 0.5
-
         drug_upper = drug.upper()
-        mutations = features.get("mutations", [])
-        expression = features.get("expression", {})
-
-        # EGFR inhibitors and EGFR mutations
-        if drug_upper in ["ERLOTINIB", "GEFITINIB"]:
-            if "EGFR" in mutations or "EGFR_L858R" in mutations:
-                prediction = "sensitive"
-                confidence = 0.85
-            elif "EGFR_T790M" in mutations:
-                prediction = "resistant"
-                confidence = 0.9
-
-        # BRAF inhibitors and BRAF mutations
-        elif drug_upper in ["VEMURAFENIB", "DABRAFENIB"]:
-            if "BRAF_V600E" in mutations or "BRAF" in mutations:
-                prediction = "sensitive"
-                confidence = 0.88
-
-        # PARP inhibitors and BRCA mutations
-        elif drug_upper in ["OLAPARIB", "TALAZOPARIB"]:
-            if "BRCA1" in mutations or "BRCA2" in mutations:
-                prediction = "sensitive"
-                confidence = 0.82
-
-        if prediction:
+        rule = _MUTATION_RULES.get(drug_upper)
+        if rule is None:
+            return None
+
+        outcome = rule(frozenset(features.get("mutations", ())))
+        if outcome:
+            prediction, confidence = outcome
+            targets, pathway = _DRUG_INFO.get(drug_upper, _NO_DRUG_INFO)
             return DrugResponsePrediction(
                 drug_name=drug,
                 predicted_response=prediction,
                 confidence=confidence,
-                drug_targets=self.DRUG_TARGETS.get(drug, []),
-                pathway=self.DRUG_PATHWAYS.get(drug),
+                drug_targets=list(targets),
+                pathway=pathway,
                 source="feature_prediction",
             )
 
         return None
 
-    def _guess_tissue(self, cell_line: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _guess_tissue(cell_line: str) -> str:
         """Guess tissue from cell line name."""
         cl_upper = cell_line.upper()
 
-        tissue_hints = {
-            "lung": ["A549", "H1299", "H460", "PC9", "HCC"],
-            "breast": ["MCF", "MDA", "T47D", "BT474", "SKBR"],
-            "colon": ["HCT", "HT29", "SW480", "COLO", "DLD"],
-            "melanoma": ["A375", "SKMEL", "MEWO", "WM"],
-            "leukemia": ["K562", "HL60", "MOLM", "KASUMI"],
-        }
-
-        for tissue, hints in tissue_hints.items():
-            for hint in hints:
-                if hint in cl_upper:
-                    return tissue
+        for tissue, pattern in _TISSUE_PATTERNS:
+            if pattern.search(cl_upper):
+                return tissue
 
         return "unknown"
 
@@ -384,14 +435,74 @@ class DrugResponsePredictor:
 
     def get_drug_info(self, drug: str) -> dict:
         """Get drug information."""
+        targets, pathway = _DRUG_INFO.get(drug.upper(), _NO_DRUG_INFO)
         return {
             "name": drug,
-            "targets": self.DRUG_TARGETS.get(drug, []),
-            "pathway": self.DRUG_PATHWAYS.get(drug),
-            "mechanism": f"Inhibitor of {', '.join(self.DRUG_TARGETS.get(drug, ['unknown']))}",
+            "targets": list(targets),
+            "pathway": pathway,
+            "mechanism": f"Inhibitor of {', '.join(targets or ('unknown',))}",
         }
 
 
+# Upper-cased drug name -> (targets, pathway); one probe, case-insensitive
+_DRUG_INFO = MappingProxyType({
+    drug.upper(): (tuple(targets), DrugResponsePredictor.DRUG_PATHWAYS.get(drug))
+    for drug, targets in DrugResponsePredictor.DRUG_TARGETS.items()
+})
+_NO_DRUG_INFO: tuple[tuple[str, ...], str | None] = ((), None)
+
+
+def _egfr_rule(mutations: frozenset) -> tuple[str, float] | None:
+    """EGFR inhibitors and EGFR mutations."""
+    if "EGFR" in mutations or "EGFR_L858R" in mutations:
+        return "sensitive", 0.85
+    if "EGFR_T790M" in mutations:
+        return "resistant", 0.9
+    return None
+
+
+def _braf_rule(mutations: frozenset) -> tuple[str, float] | None:
+    """BRAF inhibitors and BRAF mutations."""
+    if "BRAF_V600E" in mutations or "BRAF" in mutations:
+        return "sensitive", 0.88
+    return None
+
+
+def _brca_rule(mutations: frozenset) -> tuple[str, float] | None:
+    """PARP inhibitors and BRCA mutations."""
+    if "BRCA1" in mutations or "BRCA2" in mutations:
+        return "sensitive", 0.82
+    return None
+
+
+# Upper-cased drug name -> biomarker rule returning (prediction, confidence)
+_MUTATION_RULES = MappingProxyType({
+    "ERLOTINIB": _egfr_rule,
+    "GEFITINIB": _egfr_rule,
+    "VEMURAFENIB": _braf_rule,
+    "DABRAFENIB": _braf_rule,
+    "OLAPARIB": _brca_rule,
+    "TALAZOPARIB": _brca_rule,
+})
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize result dataclasses through their to_dict()."""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_json_bytes(results: list[DrugResponsePrediction]) -> bytes:
+    """Serialize results straight to JSON bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        # Passthrough keeps orjson from flattening dataclasses itself
+        return orjson.dumps(
+            results, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+    return json.dumps(results, default=_json_default).encode("utf-8")
+
+
 def predict_drug_response(
     drug: str,
     cell_line: str | None = None,
@@ -410,14 +521,33 @@ def predict_drug_response(
     Returns:
         List of drug response predictions
     """
+    results = _predict_drug_response(drug, cell_line, tissue, mutations)
+    return [r.to_dict() for r in results]
+
+
+def predict_drug_response_json(
+    drug: str,
+    cell_line: str | None = None,
+    tissue: str | None = None,
+    mutations: list[str] | None = None,
+) -> bytes:
+    """Like predict_drug_response, but return serialized JSON bytes."""
+    return to_json_bytes(_predict_drug_response(drug, cell_line, tissue, mutations))
+
+
+def _predict_drug_response(
+    drug: str,
+    cell_line: str | None,
+    tissue: str | None,
+    mutations: list[str] | None,
+) -> list[DrugResponsePrediction]:
     predictor = DrugResponsePredictor()
 
     genomic_features = None
     if mutations:
         genomic_features = {"mutations": mutations}
 
-    results = predictor.predict(drug, cell_line, tissue, genomic_features)
-    return [r.to_dict() for r in results]
+    return predictor.predict(drug, cell_line, tissue, genomic_features)
 
 
 def get_gdsc_predictions(drug: str, tissue: str | None = None) -> list[dict]:
@@ -7,13 +7,101 @@ Integrates multiple pathogenicity predictors:
 - AlphaMissense (DeepMind's missense variant predictor)
 """
 
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from operator import attrgetter
 from typing import Any
+from bisect import bisect_right
+from collections import OrderedDict
+import asyncio
+import hashlib
 import json
+import math
+import os
 import re
+import threading
 
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
 
-@dataclass
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+@lru_cache(maxsize=8192)
+def _variant_hash(key: str) -> int:
+    """Deterministic 64-bit digest used by the simulation fallbacks.
+
+    Only needs to be stable, not cryptographic, so an 8-byte BLAKE2b is used.
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+# Shared HTTP session (keep-alive, connection pooling, retries on transient
+# gateway errors). Created on first use so requests stays optional.
+_SESSION = None
+
+
+def _get_session():
+    """Return the module-wide requests.Session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+# Score lookups are I/O bound, so one shared thread pool lets CADD, REVEL and
+# AlphaMissense requests for every variant overlap. Created on first use.
+_EXECUTOR_MAX_WORKERS = 16
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the module-wide score-fetching thread pool."""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=_EXECUTOR_MAX_WORKERS,
+                    thread_name_prefix="pathogenicity",
+                )
+    return _EXECUTOR
+
+
+# Variant notation: chr:pos:ref:alt or chr-pos-ref-alt
+_VARIANT_RE = re.compile(
+    r"(?:chr)?(\w+)[:\-](\d+)[:\-]([ACGT]+)[:\-]([ACGT]+)", re.IGNORECASE
+)
+
+
+@dataclass(slots=True)
 class VariantScore:
     """Pathogenicity score for a variant."""
 
@@ -38,27 +126,42 @@ class VariantScore:
     consensus_pathogenic: bool | None = None
     confidence: str | None = None  # low, medium, high
 
+    # Reads every serialized field in one C-level call (not a dataclass field)
+    _FIELDS = attrgetter(
+        "variant", "gene", "transcript", "consequence",
+        "cadd_phred", "cadd_raw", "revel_score",
+        "alphamissense_score", "alphamissense_class",
+        "cadd_interpretation", "revel_interpretation", "alphamissense_interpretation",
+        "consensus_pathogenic", "confidence",
+    )
+
     def to_dict(self) -> dict:
+        (
+            variant, gene, transcript, consequence,
+            cadd_phred, cadd_raw, revel, am, am_class,
+            cadd_interp, revel_interp, am_interp,
+            pathogenic, confidence,
+        ) = self._FIELDS(self)
         return {
-            "variant": self.variant,
-            "gene": self.gene,
-            "transcript": self.transcript,
-            "consequence": self.consequence,
+            "variant": variant,
+            "gene": gene,
+            "transcript": transcript,
+            "consequence": consequence,
             "scores": {
-                "cadd_phred": self.cadd_phred,
-                "cadd_raw": self.cadd_raw,
-                "revel": self.revel_score,
-                "alphamissense": self.alphamissense_score,
-                "alphamissense_class": self.alphamissense_class,
+                "cadd_phred": cadd_phred,
+                "cadd_raw": cadd_raw,
+                "revel": revel,
+                "alphamissense": am,
+                "alphamissense_class": am_class,
             },
             "interpretations": {
-                "cadd": self.cadd_interpretation,
-                "revel": self.revel_interpretation,
-                "alphamissense": self.alphamissense_interpretation,
+                "cadd": cadd_interp,
+                "revel": revel_interp,
+                "alphamissense": am_interp,
             },
             "consensus": {
-                "pathogenic": self.consensus_pathogenic,
-                "confidence": self.confidence,
+                "pathogenic": pathogenic,
+                "confidence": confidence,
             },
         }
 
@@ -89,10 +192,73 @@ class PathogenicityPredictor:
         "pathogenic": 0.564,
     }
 
+    # Sorted cut points for bisect_right: a score falls in label i when it is
+    # >= cut i-1 and < cut i
+    _CADD_CUTS = (
+        CADD_THRESHOLDS["likely_benign"],
+        CADD_THRESHOLDS["uncertain"],
+        CADD_THRESHOLDS["likely_pathogenic"],
+        CADD_THRESHOLDS["pathogenic"],
+    )
+    _CADD_LABELS = ("benign", "likely_benign", "uncertain", "likely_pathogenic", "pathogenic")
+    _REVEL_CUTS = (
+        REVEL_THRESHOLDS["likely_benign"],
+        REVEL_THRESHOLDS["uncertain"],
+        REVEL_THRESHOLDS["likely_pathogenic"],
+    )
+    _REVEL_LABELS = ("benign", "likely_benign", "uncertain", "likely_pathogenic")
+    # AlphaMissense is pathogenic strictly above its cut-off
+    _AM_CUTS = (
+        ALPHAMISSENSE_THRESHOLDS["benign"],
+        math.nextafter(ALPHAMISSENSE_THRESHOLDS["pathogenic"], math.inf),
+    )
+    _AM_LABELS = ("benign", "ambiguous", "pathogenic")
+
+    CADD_API_URL = "https://cadd.gs.washington.edu/api/v1.0"
+    ENSEMBL_VEP_URL = "https://rest.ensembl.org/vep/human/region"
+    VEP_BATCH_SIZE = 200  # Ensembl's documented POST limit
+    VEP_BATCH_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+    ASYNC_CONNECTION_LIMIT = 32
+
+    DEFAULT_CACHE_DIR = "~/.cache/bioagent/pathogenicity"
+    CACHE_TTL = 30 * 24 * 3600  # Upstream scores only change between releases
+    RESULT_CACHE_SIZE = 4096  # In-memory VariantScores kept per predictor (LRU)
+
     def __init__(self, cache_dir: str | None = None):
         self.cache_dir = cache_dir
         self._cadd_client = None
         self._ensembl_client = None
+        # (variant, genome_build, include_cadd, include_revel, include_alphamissense)
+        self._result_cache: OrderedDict[tuple, VariantScore] = OrderedDict()
+        self._result_lock = threading.Lock()
+
+        # Persistent cache of upstream API responses (never simulated scores)
+        self._disk_cache = None
+        if DISKCACHE_AVAILABLE:
+            try:
+                self._disk_cache = diskcache.Cache(
+                    os.path.expanduser(cache_dir or self.DEFAULT_CACHE_DIR)
+                )
+            except OSError:
+                self._disk_cache = None
+
+    def _cache_get(self, key: str) -> Any:
+        """Read an API response from the disk cache, if enabled."""
+        if self._disk_cache is None:
+            return None
+        try:
+            return self._disk_cache.get(key)
+        except Exception:
+            return None
+
+    def _cache_set(self, key: str, value: Any) -> None:
+        """Store an API response in the disk cache, if enabled."""
+        if self._disk_cache is None:
+            return
+        try:
+            self._disk_cache.set(key, value, expire=self.CACHE_TTL)
+        except Exception:
+            pass
 
     def predict(
         self,
@@ -118,50 +284,350 @@ class PathogenicityPredictor:
         if isinstance(variants, str):
             variants = [variants]
 
+        flags = (include_cadd, include_revel, include_alphamissense)
+        found, missing = self._lookup_results(variants, genome_build, flags)
+        if missing:
+            scores, simulated = self._score_variants(missing, genome_build, *flags)
+            found.update(zip(missing, scores))
+            self._store_results(missing, scores, simulated, genome_build, flags)
+
+        # One copy per position, so callers that mutate a result touch
+        # neither the cache nor the entries returned for duplicate variants
+        return [replace(found[v]) for v in variants]
+
+    async def predict_async(
+        self,
+        variants: list[str] | str,
+        genome_build: str = "GRCh38",
+        include_cadd: bool = True,
+        include_revel: bool = True,
+        include_alphamissense: bool = True,
+    ) -> list[VariantScore]:
+        """
+        Async variant of predict() for callers already on an event loop.
+
+        All CADD and Ensembl VEP requests share one aiohttp session and run
+        concurrently on the loop. Without aiohttp, predict() runs in a worker
+        thread instead.
+
+        Args:
+            variants: Variant(s) in chr:pos:ref:alt or HGVS format
+            genome_build: Reference genome (GRCh37 or GRCh38)
+            include_cadd: Include CADD scores
+            include_revel: Include REVEL scores
+            include_alphamissense: Include AlphaMissense scores
+
+        Returns:
+            List of VariantScore objects
+        """
+        if isinstance(variants, str):
+            variants = [variants]
+
+        flags = (include_cadd, include_revel, include_alphamissense)
+        if not AIOHTTP_AVAILABLE:
+            return await asyncio.to_thread(self.predict, variants, genome_build, *flags)
+
+        found, missing = self._lookup_results(variants, genome_build, flags)
+        if missing:
+            scores, simulated = await self._score_variants_async(missing, genome_build, *flags)
+            found.update(zip(missing, scores))
+            self._store_results(missing, scores, simulated, genome_build, flags)
+
+        # One copy per position, so callers that mutate a result touch
+        # neither the cache nor the entries returned for duplicate variants
+        return [replace(found[v]) for v in variants]
+
+    def clear_cache(self) -> None:
+        """Drop all cached VariantScore results."""
+        with self._result_lock:
+            self._result_cache.clear()
+
+    def _lookup_results(
+        self,
+        variants: list[str],
+        genome_build: str,
+        flags: tuple,
+    ) -> tuple[dict[str, VariantScore], list[str]]:
+        """Split distinct variants into cached scores and those still to score.
+
+        Hits are copied out under the lock, so later evictions cannot drop
+        a result between lookup and return.
+        """
+        found: dict[str, VariantScore] = {}
+        missing: list[str] = []
+        cache = self._result_cache
+        with self._result_lock:
+            for v in dict.fromkeys(variants):
+                key = (v, genome_build, *flags)
+                score = cache.get(key)
+                if score is None:
+                    missing.append(v)
+                else:
+                    cache.move_to_end(key)
+                    found[v] = score
+        return found, missing
+
+    def _store_results(
+        self,
+        variants: list[str],
+        scores: list[VariantScore],
+        simulated: list[bool],
+        genome_build: str,
+        flags: tuple,
+    ) -> None:
+        """Cache freshly scored variants, skipping any with simulated scores.
+
+        Simulated scores stand in for failed or offline lookups; caching
+        them would keep serving fake values after the network recovers.
+        """
+        cache = self._result_cache
+        with self._result_lock:
+            for variant, score, fake in zip(variants, scores, simulated):
+                if fake:
+                    continue
+                key = (variant, genome_build, *flags)
+                cache[key] = score
+                cache.move_to_end(key)
+            while len(cache) > self.RESULT_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    def _score_variants(
+        self,
+        variants: list[str],
+        genome_build: str,
+        include_cadd: bool,
+        include_revel: bool,
+        include_alphamissense: bool,
+    ) -> tuple[list[VariantScore], list[bool]]:
+        """Score variants that are not in the result cache.
+
+        Returns the scores plus, per variant, whether any of its scores
+        had to be simulated.
+        """
+        # Parse once; every lookup below reuses the parsed components
+        parsed_variants = [self._parse_variant(v) for v in variants]
+
+        try:
+            _get_session()
+        except ImportError:
+            # No HTTP client, so every lookup would fall back to simulation
+            scores = self._predict_simulated(
+                variants, parsed_variants,
+                include_cadd, include_revel, include_alphamissense,
+            )
+            return scores, [True] * len(scores)
+
+        # One batched VEP lookup serves both REVEL and AlphaMissense
+        vep_results: dict[str, list] = {}
+        if include_revel or include_alphamissense:
+            vep_results = self._fetch_vep_batch(variants, parsed_variants, genome_build)
+
+        # Fan out every independent lookup, then fill scores serially
+        executor = _get_executor()
+        futures = {}
+        for i, (variant, parsed) in enumerate(zip(variants, parsed_variants)):
+            vep_data = vep_results.get(variant)
+            if include_cadd:
+                futures[i, "cadd"] = executor.submit(
+                    self._get_cadd_score, variant, parsed, genome_build
+                )
+            if include_revel:
+                futures[i, "revel"] = executor.submit(
+                    self._get_revel_score, variant, parsed, genome_build, vep_data
+                )
+            if include_alphamissense:
+                futures[i, "am"] = executor.submit(
+                    self._get_alphamissense_score, variant, parsed, genome_build, vep_data
+                )
+        fetched = {key: future.result() for key, future in futures.items()}
+
+        return self._build_scores(variants, parsed_variants, fetched)
+
+    async def _score_variants_async(
+        self,
+        variants: list[str],
+        genome_build: str,
+        include_cadd: bool,
+        include_revel: bool,
+        include_alphamissense: bool,
+    ) -> tuple[list[VariantScore], list[bool]]:
+        """Score uncached variants with concurrent aiohttp requests."""
+        parsed_variants = [self._parse_variant(v) for v in variants]
+
+        connector = aiohttp.TCPConnector(limit=self.ASYNC_CONNECTION_LIMIT)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            vep_results: dict[str, list] = {}
+            if include_revel or include_alphamissense:
+                vep_results = await self._fetch_vep_batch_async(
+                    session, variants, parsed_variants, genome_build
+                )
+
+                # Variants the batch missed get one single lookup each, shared
+                # by REVEL and AlphaMissense; failures become [] so the sync
+                # getters below simulate instead of going back to the network
+                retry = [
+                    (variant, parsed)
+                    for variant, parsed in zip(variants, parsed_variants)
+                    if parsed and variant not in vep_results
+                ]
+                singles = await asyncio.gather(
+                    *(self._fetch_vep_async(session, parsed) for _, parsed in retry),
+                    return_exceptions=True,
+                )
+                for (variant, _), data in zip(retry, singles):
+                    vep_results[variant] = data if isinstance(data, list) else []
+
+            cadd_results = []
+            if include_cadd:
+                cadd_results = await asyncio.gather(*(
+                    self._get_cadd_score_async(session, variant, parsed, genome_build)
+                    for variant, parsed in zip(variants, parsed_variants)
+                ))
+
+        fetched = {}
+        for i, (variant, parsed) in enumerate(zip(variants, parsed_variants)):
+            vep_data = vep_results.get(variant)
+            if include_cadd:
+                fetched[i, "cadd"] = cadd_results[i]
+            if include_revel:
+                fetched[i, "revel"] = self._get_revel_score(
+                    variant, parsed, genome_build, vep_data
+                )
+            if include_alphamissense:
+                fetched[i, "am"] = self._get_alphamissense_score(
+                    variant, parsed, genome_build, vep_data
+                )
+
+        return self._build_scores(variants, parsed_variants, fetched)
+
+    def _build_scores(
+        self,
+        variants: list[str],
+        parsed_variants: list[dict | None],
+        fetched: dict[tuple[int, str], Any],
+    ) -> tuple[list[VariantScore], list[bool]]:
+        """Assemble VariantScores from fetched (index, source) results.
+
+        Each fetched entry is a ``(value, simulated)`` pair from a getter.
+        """
         results = []
-        for variant in variants:
+        simulated = []
+        no_result = (None, False)
+        for i, variant in enumerate(variants):
             score = VariantScore(variant=variant)
 
-            # Parse variant
-            parsed = self._parse_variant(variant)
+            parsed = parsed_variants[i]
             if parsed:
                 score.gene = parsed.get("gene")
                 score.consequence = parsed.get("consequence")
 
-            # Get scores
-            if include_cadd:
-                cadd = self._get_cadd_score(variant, genome_build)
-                if cadd:
-                    score.cadd_phred = cadd.get("phred")
-                    score.cadd_raw = cadd.get("raw")
-                    score.cadd_interpretation = self._interpret_cadd(cadd.get("phred"))
+            cadd, cadd_sim = fetched.get((i, "cadd"), no_result)
+            revel, revel_sim = fetched.get((i, "revel"), no_result)
+            am, am_sim = fetched.get((i, "am"), no_result)
+            simulated.append(cadd_sim or revel_sim or am_sim)
 
-            if include_revel:
-                revel = self._get_revel_score(variant, genome_build)
-                if revel:
-                    score.revel_score = revel
-                    score.revel_interpretation = self._interpret_revel(revel)
+            if cadd:
+                score.cadd_phred = cadd.get("phred")
+                score.cadd_raw = cadd.get("raw")
+                score.cadd_interpretation = self._interpret_cadd(cadd.get("phred"))
 
-            if include_alphamissense:
-                am = self._get_alphamissense_score(variant, genome_build)
-                if am:
-                    score.alphamissense_score = am.get("score")
-                    score.alphamissense_class = am.get("class")
-                    score.alphamissense_interpretation = self._interpret_alphamissense(
-                        am.get("score")
-                    )
+            if revel:
+                score.revel_score = revel
+                score.revel_interpretation = self._interpret_revel(revel)
+
+            if am:
+                score.alphamissense_score = am.get("score")
+                score.alphamissense_class = am.get("class")
+                score.alphamissense_interpretation = self._interpret_alphamissense(
+                    am.get("score")
+                )
+
+            results.append(score)
 
-            # Calculate consensus
-            score.consensus_pathogenic, score.confidence = self._calculate_consensus(score)
+        self._apply_consensus(results)
+        return results, simulated
+
+    def _predict_simulated(
+        self,
+        variants: list[str],
+        parsed_variants: list[dict | None],
+        include_cadd: bool,
+        include_revel: bool,
+        include_alphamissense: bool,
+    ) -> list[VariantScore]:
+        """Build VariantScores for a whole batch from simulated scores."""
+        sim = self._simulate_batch(variants)
+        cadd_phred = sim["cadd_phred"].tolist()
+        cadd_raw = sim["cadd_raw"].tolist()
+        cadd_interp = sim["cadd_interpretation"].tolist()
+        revel = sim["revel"].tolist()
+        revel_interp = sim["revel_interpretation"].tolist()
+        am = sim["am"].tolist()
+        am_class = sim["am_class"].tolist()
+
+        results = []
+        for i, (variant, parsed) in enumerate(zip(variants, parsed_variants)):
+            score = VariantScore(variant=variant)
+
+            if include_cadd:
+                score.cadd_phred = cadd_phred[i]
+                score.cadd_raw = cadd_raw[i]
+                score.cadd_interpretation = cadd_interp[i]
+
+            # REVEL and AlphaMissense need a parseable variant
+            if parsed:
+                score.gene = parsed.get("gene")
+                score.consequence = parsed.get("consequence")
+                if include_revel and revel[i]:
+                    score.revel_score = revel[i]
+                    score.revel_interpretation = revel_interp[i]
+                if include_alphamissense:
+                    score.alphamissense_score = am[i]
+                    score.alphamissense_class = am_class[i]
+                    score.alphamissense_interpretation = am_class[i]
 
             results.append(score)
 
+        self._apply_consensus(results)
         return results
 
+    def _simulate_batch(self, variants: list[str]) -> dict:
+        """Simulate CADD, REVEL and AlphaMissense scores for many variants.
+
+        Vectorized equivalent of the per-variant ``_simulate_*`` methods:
+        returns ``(N,)`` arrays of scores and their interpretations.
+        """
+        import numpy as np
+
+        # 64-bit digests fit uint64 exactly, so residues match the scalar path
+        hashes = np.fromiter(
+            (_variant_hash(v) for v in variants), dtype=np.uint64, count=len(variants)
+        )
+
+        def digest_mod(m: int):
+            return hashes % np.uint64(m)
+
+        cadd_phred = digest_mod(400) / 10
+        cadd_raw = (cadd_phred - 20) / 10
+        revel = np.round(digest_mod(1000) / 1000, 3)
+
+        # side="right" matches the scalar bisect_right classification
+        def classify(values, cuts, labels):
+            return np.array(labels)[np.searchsorted(cuts, values, side="right")]
+
+        return {
+            "cadd_phred": np.round(cadd_phred, 2),
+            "cadd_raw": np.round(cadd_raw, 4),
+            "cadd_interpretation": classify(cadd_phred, self._CADD_CUTS, self._CADD_LABELS),
+            "revel": revel,
+            "revel_interpretation": classify(revel, self._REVEL_CUTS, self._REVEL_LABELS),
+            "am": revel,
+            "am_class": classify(revel, self._AM_CUTS, self._AM_LABELS),
+        }
+
     def _parse_variant(self, variant: str) -> dict | None:
         """Parse variant string to extract components."""
-        # Format: chr:pos:ref:alt or chr-pos-ref-alt
-        match = re.match(r"(?:chr)?(\w+)[:\-](\d+)[:\-]([ACGT]+)[:\-]([ACGT]+)", variant, re.I)
+        match = _VARIANT_RE.match(variant)
         if match:
             return {
                 "chrom": match.group(1),
@@ -171,118 +637,310 @@ class PathogenicityPredictor:
             }
         return None
 
-    def _get_cadd_score(self, variant: str, genome_build: str) -> dict | None:
-        """Get CADD score from API or cache."""
+    def _get_cadd_score(
+        self,
+        variant: str,
+        parsed: dict | None,
+        genome_build: str,
+    ) -> tuple[dict | None, bool]:
+        """Get CADD score from API or cache, as ``(score, simulated)``."""
         try:
-            import requests
+            session = _get_session()
 
-            parsed = self._parse_variant(variant)
             if not parsed:
-                return None
+                return None, False
 
-            # CADD API endpoint
-            build = "GRCh38" if "38" in genome_build else "GRCh37"
-            url = f"https://cadd.gs.washington.edu/api/v1.0/{build}/{parsed['chrom']}:{parsed['pos']}"
+            cache_key = f"cadd:{genome_build}:{variant}"
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached, False
 
-            response = requests.get(url, timeout=30)
+            response = session.get(self._cadd_url(parsed, genome_build), timeout=30)
             if response.status_code == 200:
-                data = response.json()
-                # Find matching variant
-                for item in data:
-                    if item.get("Alt") == parsed["alt"]:
-                        return {
-                            "phred": item.get("PHRED"),
-                            "raw": item.get("RawScore"),
-                        }
+                cadd = self._match_cadd(response.json(), parsed)
+                if cadd:
+                    self._cache_set(cache_key, cadd)
+                    return cadd, False
 
         except Exception:
             pass
 
         # Return simulated score for testing
-        return self._simulate_cadd_score(variant)
+        return self._simulate_cadd_score(variant), True
+
+    async def _get_cadd_score_async(
+        self,
+        session: "aiohttp.ClientSession",
+        variant: str,
+        parsed: dict | None,
+        genome_build: str,
+    ) -> tuple[dict | None, bool]:
+        """Async _get_cadd_score on a shared aiohttp session."""
+        if not parsed:
+            return None, False
+
+        cache_key = f"cadd:{genome_build}:{variant}"
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached, False
+
+        try:
+            async with session.get(
+                self._cadd_url(parsed, genome_build),
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as response:
+                if response.status == 200:
+                    cadd = self._match_cadd(await response.json(content_type=None), parsed)
+                    if cadd:
+                        self._cache_set(cache_key, cadd)
+                        return cadd, False
+        except Exception:
+            pass
+
+        return self._simulate_cadd_score(variant), True
+
+    def _cadd_url(self, parsed: dict, genome_build: str) -> str:
+        """CADD API endpoint for a parsed variant's position."""
+        build = "GRCh38" if "38" in genome_build else "GRCh37"
+        return f"{self.CADD_API_URL}/{build}/{parsed['chrom']}:{parsed['pos']}"
+
+    def _match_cadd(self, data: list, parsed: dict) -> dict | None:
+        """Pick the CADD entry matching the variant's alternate allele."""
+        for item in data:
+            if item.get("Alt") == parsed["alt"]:
+                return {
+                    "phred": item.get("PHRED"),
+                    "raw": item.get("RawScore"),
+                }
+        return None
 
     def _simulate_cadd_score(self, variant: str) -> dict:
         """Simulate CADD score for testing."""
-        import hashlib
-
         # Generate deterministic score based on variant
-        hash_val = int(hashlib.md5(variant.encode()).hexdigest(), 16)
+        hash_val = _variant_hash(variant)
         phred = (hash_val % 400) / 10  # 0-40 range
         raw = (phred - 20) / 10  # Approximate raw score
 
         return {"phred": round(phred, 2), "raw": round(raw, 4)}
 
-    def _get_revel_score(self, variant: str, genome_build: str) -> float | None:
-        """Get REVEL score."""
-        try:
-            import requests
+    def _fetch_vep_batch(
+        self,
+        variants: list[str],
+        parsed_variants: list[dict | None],
+        genome_build: str,
+    ) -> dict[str, list]:
+        """Query Ensembl VEP for many variants with batched POST requests.
+
+        Returns the VEP result list per input variant string, served from
+        the disk cache where possible. Variants that cannot be parsed, or
+        whose batch failed, are left out so callers can fall back to
+        single-variant lookups.
+        """
+        found, inputs = self._vep_batch_inputs(variants, parsed_variants, genome_build)
+        if not inputs:
+            return found
 
-            parsed = self._parse_variant(variant)
+        try:
+            session = _get_session()
+        except ImportError:
+            return found
+
+        by_input: dict[str, list] = {}
+        for chunk in self._vep_chunks(inputs):
+            try:
+                response = session.post(
+                    self.ENSEMBL_VEP_URL,
+                    headers=self.VEP_BATCH_HEADERS,
+                    json={"variants": chunk, "REVEL": 1, "AlphaMissense": 1},
+                    timeout=60,
+                )
+                if response.status_code != 200:
+                    continue
+                for result in response.json():
+                    by_input.setdefault(result.get("input"), []).append(result)
+            except Exception:
+                continue
+
+        self._store_vep_results(found, inputs, by_input, genome_build)
+        return found
+
+    async def _fetch_vep_batch_async(
+        self,
+        session: "aiohttp.ClientSession",
+        variants: list[str],
+        parsed_variants: list[dict | None],
+        genome_build: str,
+    ) -> dict[str, list]:
+        """Async _fetch_vep_batch: all POST chunks are sent concurrently."""
+        found, inputs = self._vep_batch_inputs(variants, parsed_variants, genome_build)
+        if not inputs:
+            return found
+
+        async def post(chunk: list[str]) -> list:
+            async with session.post(
+                self.ENSEMBL_VEP_URL,
+                headers=self.VEP_BATCH_HEADERS,
+                json={"variants": chunk, "REVEL": 1, "AlphaMissense": 1},
+                timeout=aiohttp.ClientTimeout(total=60),
+            ) as response:
+                if response.status != 200:
+                    return []
+                return await response.json(content_type=None)
+
+        responses = await asyncio.gather(
+            *(post(chunk) for chunk in self._vep_chunks(inputs)),
+            return_exceptions=True,
+        )
+
+        by_input: dict[str, list] = {}
+        for results in responses:
+            if isinstance(results, BaseException):
+                continue
+            for result in results:
+                by_input.setdefault(result.get("input"), []).append(result)
+
+        self._store_vep_results(found, inputs, by_input, genome_build)
+        return found
+
+    def _vep_batch_inputs(
+        self,
+        variants: list[str],
+        parsed_variants: list[dict | None],
+        genome_build: str,
+    ) -> tuple[dict[str, list], dict[str, str]]:
+        """Split variants into disk-cached VEP results and VEP inputs to query."""
+        found: dict[str, list] = {}
+
+        # VEP region input uses VCF-style "chrom pos id ref alt" strings
+        inputs: dict[str, str] = {}
+        for variant, parsed in zip(variants, parsed_variants):
             if not parsed:
-                return None
+                continue
+            cached = self._cache_get(f"vep:{genome_build}:{variant}")
+            if cached is not None:
+                found[variant] = cached
+            else:
+                inputs[variant] = (
+                    f"{parsed['chrom']} {parsed['pos']} . {parsed['ref']} {parsed['alt']}"
+                )
+
+        return found, inputs
+
+    def _vep_chunks(self, inputs: dict[str, str]) -> list[list[str]]:
+        """Unique VEP inputs split into POST-sized chunks."""
+        unique_inputs = list(dict.fromkeys(inputs.values()))
+        return [
+            unique_inputs[start:start + self.VEP_BATCH_SIZE]
+            for start in range(0, len(unique_inputs), self.VEP_BATCH_SIZE)
+        ]
+
+    def _store_vep_results(
+        self,
+        found: dict[str, list],
+        inputs: dict[str, str],
+        by_input: dict[str, list],
+        genome_build: str,
+    ) -> None:
+        """Map VEP results back to variants and write them to the disk cache."""
+        for variant, vep_input in inputs.items():
+            if vep_input in by_input:
+                found[variant] = by_input[vep_input]
+                self._cache_set(f"vep:{genome_build}:{variant}", found[variant])
+
+    def _fetch_vep(self, parsed: dict) -> list | None:
+        """Query Ensembl VEP for a single parsed variant."""
+        session = _get_session()
+
+        response = session.get(
+            self._vep_url(parsed), headers={"Content-Type": "application/json"}, timeout=30
+        )
+        if response.status_code == 200:
+            return response.json()
+        return None
 
-            # Query Ensembl VEP for REVEL
-            url = f"https://rest.ensembl.org/vep/human/region/{parsed['chrom']}:{parsed['pos']}:{parsed['pos']}/{parsed['alt']}"
-            headers = {"Content-Type": "application/json"}
+    async def _fetch_vep_async(
+        self,
+        session: "aiohttp.ClientSession",
+        parsed: dict,
+    ) -> list | None:
+        """Async _fetch_vep on a shared aiohttp session."""
+        async with session.get(
+            self._vep_url(parsed),
+            headers={"Content-Type": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as response:
+            if response.status == 200:
+                return await response.json(content_type=None)
+        return None
 
-            response = requests.get(url, headers=headers, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
-                for result in data:
-                    for tc in result.get("transcript_consequences", []):
-                        if "revel_score" in tc:
-                            return tc["revel_score"]
+    def _vep_url(self, parsed: dict) -> str:
+        """Ensembl VEP region endpoint for a single parsed variant."""
+        return f"{self.ENSEMBL_VEP_URL}/{parsed['chrom']}:{parsed['pos']}:{parsed['pos']}/{parsed['alt']}"
+
+    def _get_revel_score(
+        self,
+        variant: str,
+        parsed: dict | None,
+        genome_build: str,
+        vep_data: list | None = None,
+    ) -> tuple[float | None, bool]:
+        """Get REVEL score as ``(score, simulated)``, from prefetched VEP results when given."""
+        try:
+            if vep_data is None:
+                if not parsed:
+                    return None, False
+                vep_data = self._fetch_vep(parsed)
+
+            for result in vep_data or []:
+                for tc in result.get("transcript_consequences", []):
+                    if "revel_score" in tc:
+                        return tc["revel_score"], False
 
         except Exception:
             pass
 
         # Simulate for testing
-        return self._simulate_revel_score(variant)
+        return self._simulate_revel_score(variant), True
 
     def _simulate_revel_score(self, variant: str) -> float:
         """Simulate REVEL score for testing."""
-        import hashlib
-
-        hash_val = int(hashlib.md5(variant.encode()).hexdigest(), 16)
+        hash_val = _variant_hash(variant)
         return round((hash_val % 1000) / 1000, 3)
 
-    def _get_alphamissense_score(self, variant: str, genome_build: str) -> dict | None:
-        """Get AlphaMissense score."""
+    def _get_alphamissense_score(
+        self,
+        variant: str,
+        parsed: dict | None,
+        genome_build: str,
+        vep_data: list | None = None,
+    ) -> tuple[dict | None, bool]:
+        """Get AlphaMissense score as ``(score, simulated)``, from prefetched VEP results when given."""
         try:
-            import requests
-
-            parsed = self._parse_variant(variant)
-            if not parsed:
-                return None
-
             # AlphaMissense data is available through various APIs
             # Using Ensembl as a proxy
-            url = f"https://rest.ensembl.org/vep/human/region/{parsed['chrom']}:{parsed['pos']}:{parsed['pos']}/{parsed['alt']}"
-            headers = {"Content-Type": "application/json"}
-
-            response = requests.get(url, headers=headers, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
-                for result in data:
-                    for tc in result.get("transcript_consequences", []):
-                        if "alphamissense_score" in tc:
-                            score = tc["alphamissense_score"]
-                            return {
-                                "score": score,
-                                "class": self._classify_alphamissense(score),
-                            }
+            if vep_data is None:
+                if not parsed:
+                    return None, False
+                vep_data = self._fetch_vep(parsed)
+
+            for result in vep_data or []:
+                for tc in result.get("transcript_consequences", []):
+                    if "alphamissense_score" in tc:
+                        score = tc["alphamissense_score"]
+                        return {
+                            "score": score,
+                            "class": self._classify_alphamissense(score),
+                        }, False
 
         except Exception:
             pass
 
         # Simulate for testing
-        return self._simulate_alphamissense_score(variant)
+        return self._simulate_alphamissense_score(variant), True
 
     def _simulate_alphamissense_score(self, variant: str) -> dict:
         """Simulate AlphaMissense score for testing."""
-        import hashlib
-
-        hash_val = int(hashlib.md5(variant.encode()).hexdigest(), 16)
+        hash_val = _variant_hash(variant)
         score = round((hash_val % 1000) / 1000, 3)
         return {
             "score": score,
@@ -291,40 +949,19 @@ class PathogenicityPredictor:
 
     def _classify_alphamissense(self, score: float) -> str:
         """Classify AlphaMissense score."""
-        if score < self.ALPHAMISSENSE_THRESHOLDS["benign"]:
-            return "benign"
-        elif score > self.ALPHAMISSENSE_THRESHOLDS["pathogenic"]:
-            return "pathogenic"
-        else:
-            return "ambiguous"
+        return self._AM_LABELS[bisect_right(self._AM_CUTS, score)]
 
     def _interpret_cadd(self, phred: float | None) -> str:
         """Interpret CADD PHRED score."""
         if phred is None:
             return "unknown"
-        if phred >= self.CADD_THRESHOLDS["pathogenic"]:
-            return "pathogenic"
-        elif phred >= self.CADD_THRESHOLDS["likely_pathogenic"]:
-            return "likely_pathogenic"
-        elif phred >= self.CADD_THRESHOLDS["uncertain"]:
-            return "uncertain"
-        elif phred >= self.CADD_THRESHOLDS["likely_benign"]:
-            return "likely_benign"
-        else:
-            return "benign"
+        return self._CADD_LABELS[bisect_right(self._CADD_CUTS, phred)]
 
     def _interpret_revel(self, score: float | None) -> str:
         """Interpret REVEL score."""
         if score is None:
             return "unknown"
-        if score >= self.REVEL_THRESHOLDS["likely_pathogenic"]:
-            return "likely_pathogenic"
-        elif score >= self.REVEL_THRESHOLDS["uncertain"]:
-            return "uncertain"
-        elif score >= self.REVEL_THRESHOLDS["likely_benign"]:
-            return "likely_benign"
-        else:
-            return "benign"
+        return self._REVEL_LABELS[bisect_right(self._REVEL_CUTS, score)]
 
     def _interpret_alphamissense(self, score: float | None) -> str:
         """Interpret AlphaMissense score."""
@@ -332,46 +969,96 @@ class PathogenicityPredictor:
             return "unknown"
         return self._classify_alphamissense(score)
 
-    def _calculate_consensus(self, score: VariantScore) -> tuple[bool | None, str]:
-        """Calculate consensus pathogenicity from multiple scores."""
-        votes = []
-        weights = []
-
-        if score.cadd_interpretation:
-            is_path = score.cadd_interpretation in ("pathogenic", "likely_pathogenic")
-            votes.append(is_path)
-            weights.append(1.0)
-
-        if score.revel_interpretation:
-            is_path = score.revel_interpretation in ("pathogenic", "likely_pathogenic")
-            votes.append(is_path)
-            weights.append(1.2)  # REVEL slightly higher weight
+    # Consensus vote weights: CADD, REVEL (slightly higher), AlphaMissense (highest)
+    _CONSENSUS_WEIGHTS = (1.0, 1.2, 1.5)
+    _CONFIDENCE_LABELS = ("low", "medium", "high")
 
-        if score.alphamissense_interpretation:
-            is_path = score.alphamissense_interpretation == "pathogenic"
-            votes.append(is_path)
-            weights.append(1.5)  # AlphaMissense highest weight
+    def _apply_consensus(self, scores: list[VariantScore]) -> None:
+        """Fill consensus fields for a batch of scores in place."""
+        pathogenic, confidence = self._calculate_consensus_batch(scores)
+        for score, is_path, conf in zip(scores, pathogenic, confidence):
+            score.consensus_pathogenic = is_path
+            score.confidence = conf
 
-        if not votes:
-            return None, "unknown"
-
-        # Weighted voting
-        weighted_sum = sum(v * w for v, w in zip(votes, weights))
-        total_weight = sum(weights)
-        score_ratio = weighted_sum / total_weight
-
-        is_pathogenic = score_ratio > 0.5
-
-        # Confidence based on agreement
-        agreement = sum(1 for v in votes if v == is_pathogenic) / len(votes)
-        if agreement >= 0.9:
-            confidence = "high"
-        elif agreement >= 0.6:
-            confidence = "medium"
-        else:
-            confidence = "low"
-
-        return is_pathogenic, confidence
+    def _calculate_consensus_batch(
+        self,
+        scores: list[VariantScore],
+    ) -> tuple[list[bool | None], list[str]]:
+        """Weighted-vote consensus pathogenicity for a batch of scores.
+
+        Each predictor with an interpretation votes pathogenic or not; the
+        call is pathogenic when the weighted share of pathogenic votes
+        exceeds one half. Confidence reflects the fraction of voters that
+        agree with the call (>= 0.9 high, >= 0.6 medium, else low), and
+        variants with no votes get None / "unknown".
+
+        Builds an (N, 3) vote matrix plus a mask of which predictors voted,
+        then weighs votes with one matrix product.
+        """
+        import numpy as np
+
+        if not scores:
+            return [], []
+
+        path_labels = ("pathogenic", "likely_pathogenic")
+        present = np.array([
+            (
+                bool(s.cadd_interpretation),
+                bool(s.revel_interpretation),
+                bool(s.alphamissense_interpretation),
+            )
+            for s in scores
+        ])
+        votes = np.array([
+            (
+                s.cadd_interpretation in path_labels,
+                s.revel_interpretation in path_labels,
+                s.alphamissense_interpretation == "pathogenic",
+            )
+            for s in scores
+        ]) & present
+
+        weights = np.array(self._CONSENSUS_WEIGHTS)
+        n_votes = present.sum(axis=1)
+        has_votes = n_votes > 0
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = (votes @ weights) / (present @ weights)
+            is_pathogenic = ratio > 0.5
+            agreement = ((votes == is_pathogenic[:, None]) & present).sum(axis=1) / n_votes
+
+        level = (agreement >= 0.6).astype(np.intp) + (agreement >= 0.9)
+        confidence = np.array(self._CONFIDENCE_LABELS)[level]
+        confidence = np.where(has_votes, confidence, "unknown")
+
+        pathogenic = [
+            bool(p) if voted else None
+            for p, voted in zip(is_pathogenic.tolist(), has_votes.tolist())
+        ]
+        return pathogenic, confidence.tolist()
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize result dataclasses through their to_dict()."""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_json_bytes(results: list[VariantScore]) -> bytes:
+    """Serialize results straight to JSON bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        # Passthrough keeps orjson from flattening dataclasses itself
+        return orjson.dumps(
+            results, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+    return json.dumps(results, default=_json_default).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _get_default_predictor() -> PathogenicityPredictor:
+    """Shared predictor so the helpers below reuse one result cache."""
+    return PathogenicityPredictor()
 
 
 def predict_variant_pathogenicity(
@@ -388,14 +1075,23 @@ def predict_variant_pathogenicity(
     Returns:
         List of pathogenicity predictions
     """
-    predictor = PathogenicityPredictor()
+    predictor = _get_default_predictor()
     results = predictor.predict(variants, genome_build)
     return [r.to_dict() for r in results]
 
 
+def predict_variant_pathogenicity_json(
+    variants: list[str] | str,
+    genome_build: str = "GRCh38",
+) -> bytes:
+    """Like predict_variant_pathogenicity, but return serialized JSON bytes."""
+    predictor = _get_default_predictor()
+    return to_json_bytes(predictor.predict(variants, genome_build))
+
+
 def get_cadd_scores(variants: list[str], genome_build: str = "GRCh38") -> list[dict]:
     """Get CADD scores for variants."""
-    predictor = PathogenicityPredictor()
+    predictor = _get_default_predictor()
     results = predictor.predict(
         variants, genome_build,
         include_cadd=True,
@@ -415,7 +1111,7 @@ def get_cadd_scores(variants: list[str], genome_build: str = "GRCh38") -> list[d
 
 def get_revel_scores(variants: list[str], genome_build: str = "GRCh38") -> list[dict]:
     """Get REVEL scores for variants."""
-    predictor = PathogenicityPredictor()
+    predictor = _get_default_predictor()
     results = predictor.predict(
         variants, genome_build,
         include_cadd=False,
@@ -434,7 +1130,7 @@ def get_revel_scores(variants: list[str], genome_build: str = "GRCh38") -> list[
 
 def get_alphamissense_scores(variants: list[str], genome_build: str = "GRCh38") -> list[dict]:
     """Get AlphaMissense scores for variants."""
-    predictor = PathogenicityPredictor()
+    predictor = _get_default_predictor()
     results = predictor.predict(
         variants, genome_build,
         include_cadd=False,
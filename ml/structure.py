@@ -6,14 +6,126 @@ Integrates structure prediction services:
 - ESMFold (Meta's structure predictor)
 """
 
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+import gzip
+import hashlib
 import json
+import os
+import re
+import tempfile
+import threading
 import time
 
-
-@dataclass
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+if TYPE_CHECKING:
+    import numpy as np
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Sequences at least this long use the numba kernel for simulated pLDDT;
+# shorter ones stay on NumPy, where JIT dispatch costs more than it saves.
+NUMBA_MIN_RESIDUES = 10_000
+
+if NUMBA_AVAILABLE:
+    import numpy as np
+
+    @numba.njit(cache=True)
+    def _simulated_plddt_kernel(codepoints, hash_val):
+        """Per-residue simulated pLDDT in a single fused pass."""
+        n = codepoints.shape[0]
+        out = np.empty(n, dtype=np.int64)
+        for i in range(n):
+            jitter = (hash_val >> np.uint64(i)) % np.uint64(15) if i < 64 else 0
+            out[i] = 70 + codepoints[i] % 20 + jitter
+        return out
+
+
+def _seed_hash(key: str) -> int:
+    """Deterministic 64-bit digest used to seed the simulation fallbacks.
+
+    Only needs to be stable, not cryptographic, so an 8-byte BLAKE2b is used.
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+# Caps concurrent AlphaFold DB requests across all predictors and threads
+ALPHAFOLD_MAX_CONCURRENT = 4
+_ALPHAFOLD_SLOTS = threading.BoundedSemaphore(ALPHAFOLD_MAX_CONCURRENT)
+
+
+# Queries made only of the 20 standard residues are treated as sequences
+_AA_SEQUENCE_RE = re.compile(r"[ACDEFGHIKLMNPQRSTVWY]+", re.IGNORECASE)
+
+# 1-letter -> 3-letter amino acid codes
+_AA_3LETTER = {
+    "A": "ALA", "C": "CYS", "D": "ASP", "E": "GLU", "F": "PHE",
+    "G": "GLY", "H": "HIS", "I": "ILE", "K": "LYS", "L": "LEU",
+    "M": "MET", "N": "ASN", "P": "PRO", "Q": "GLN", "R": "ARG",
+    "S": "SER", "T": "THR", "V": "VAL", "W": "TRP", "Y": "TYR",
+}
+
+# The same codes indexed by ord() over ASCII, either case; anything else is UNK
+_AA_BY_ORD = tuple(_AA_3LETTER.get(chr(o).upper(), "UNK") for o in range(128))
+
+# CA-only mock ATOM record: serial, residue name, residue number, x. Atoms sit
+# on the x axis (y = z = 0) with a fixed mock pLDDT of 80 in the B-factor column.
+# Everything but the residue name depends only on the index, so the text on
+# either side of it is formatted once per index and reused across calls.
+# Only the first MOCK_CA_CACHE_SIZE indexes are kept, so one very long
+# sequence does not pin its records for the life of the process.
+MOCK_CA_CACHE_SIZE = 4096
+_MOCK_CA_HEAD = "ATOM  %5d  CA  "
+_MOCK_CA_TAIL = " A%4d    %8.3f   0.000   0.000  1.00 80.00           C"
+_mock_ca_heads: list[str] = []
+_mock_ca_tails: list[str] = []
+_mock_ca_lock = threading.Lock()
+
+
+def _mock_ca_affixes(n: int) -> tuple[list[str], list[str]]:
+    """Pre-formatted record text before/after the residue name, for >= n atoms."""
+    cached = min(n, MOCK_CA_CACHE_SIZE)
+    if len(_mock_ca_heads) < cached:
+        with _mock_ca_lock:
+            for i in range(len(_mock_ca_heads), cached):
+                _mock_ca_tails.append(_MOCK_CA_TAIL % (i + 1, i * 3.8))
+                _mock_ca_heads.append(_MOCK_CA_HEAD % (i + 1))
+    if n <= len(_mock_ca_heads):
+        return _mock_ca_heads, _mock_ca_tails
+
+    # Indexes past the cached prefix are formatted for this call only
+    extra = range(len(_mock_ca_heads), n)
+    return (
+        _mock_ca_heads + [_MOCK_CA_HEAD % (i + 1) for i in extra],
+        _mock_ca_tails + [_MOCK_CA_TAIL % (i + 1, i * 3.8) for i in extra],
+    )
+
+
+@dataclass(slots=True)
 class StructurePrediction:
     """Predicted protein structure."""
 
@@ -24,10 +136,10 @@ class StructurePrediction:
     # Structure data
     pdb_string: str | None = None
     pdb_url: str | None = None
-    pae_matrix: list[list[float]] | None = None  # Predicted aligned error
+    pae_matrix: "np.ndarray | None" = None  # Predicted aligned error (float32, L x L)
 
     # Quality metrics
-    plddt_scores: list[float] | None = None  # Per-residue confidence
+    plddt_scores: "np.ndarray | None" = None  # Per-residue confidence (float64)
     mean_plddt: float | None = None
     ptm_score: float | None = None  # Predicted TM-score
 
@@ -35,7 +147,19 @@ class StructurePrediction:
     model_version: str | None = None
     organism: str | None = None
 
+    def __post_init__(self):
+        # Keep the bulky per-residue data as arrays; lists are accepted
+        # from callers and caches and converted here
+        if self.plddt_scores is not None or self.pae_matrix is not None:
+            import numpy as np
+
+            if self.plddt_scores is not None:
+                self.plddt_scores = np.asarray(self.plddt_scores, dtype=np.float64)
+            if self.pae_matrix is not None:
+                self.pae_matrix = np.asarray(self.pae_matrix, dtype=np.float32)
+
     def to_dict(self) -> dict:
+        plddt = self.plddt_scores
         return {
             "protein_id": self.protein_id,
             "sequence": self.sequence,
@@ -44,12 +168,37 @@ class StructurePrediction:
             "quality": {
                 "mean_plddt": self.mean_plddt,
                 "ptm_score": self.ptm_score,
-                "plddt_scores": self.plddt_scores[:10] if self.plddt_scores else None,  # First 10
+                "plddt_scores": plddt[:10].tolist() if plddt is not None and plddt.size else None,  # First 10
             },
             "model_version": self.model_version,
             "organism": self.organism,
         }
 
+    def to_json(self) -> bytes:
+        """Serialize to JSON bytes (orjson when available)."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict()).encode("utf-8")
+
+    def to_msgpack(self) -> bytes:
+        """Serialize every field to MessagePack (JSON bytes as fallback)."""
+        record = {f.name: getattr(self, f.name) for f in fields(self)}
+        for name in ("plddt_scores", "pae_matrix"):
+            if record[name] is not None:
+                record[name] = record[name].tolist()
+        if MSGPACK_AVAILABLE:
+            return msgpack.packb(record, use_bin_type=True)
+        return json.dumps(record).encode("utf-8")
+
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> "StructurePrediction":
+        """Rebuild a prediction serialized with to_msgpack()."""
+        if MSGPACK_AVAILABLE and not data.startswith(b"{"):
+            record = msgpack.unpackb(data, raw=False)
+        else:
+            record = json.loads(data)
+        return cls(**record)
+
     def save_pdb(self, path: str) -> str:
         """Save PDB structure to file."""
         if not self.pdb_string:
@@ -58,8 +207,12 @@ class StructurePrediction:
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(path, "w") as f:
-            f.write(self.pdb_string)
+        # PDB text is ASCII, so encode once and skip the text-layer codec
+        data = self.pdb_string
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(data)
 
         return str(path)
 
@@ -75,10 +228,57 @@ class StructurePredictor:
     ALPHAFOLD_API = "https://alphafold.ebi.ac.uk/api"
     ESMFOLD_API = "https://api.esmatlas.com/foldSequence/v1/pdb/"
 
+    CACHE_VERSION = "v1"  # Bump to invalidate entries written by older code
+    CACHE_TTL = 30 * 24 * 3600
+
     def __init__(self, cache_dir: str | None = None):
         self.cache_dir = Path(cache_dir) if cache_dir else None
         if self.cache_dir:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._session = None
+
+        # Persistent cache of AlphaFold/UniProt/ESMFold responses under cache_dir
+        self._disk_cache = None
+        if self.cache_dir and DISKCACHE_AVAILABLE:
+            self._disk_cache = diskcache.Cache(str(self.cache_dir))
+
+    def _cache_get(self, key: str) -> Any:
+        """Read a cached API response, if caching is enabled."""
+        if self._disk_cache is None:
+            return None
+        try:
+            return self._disk_cache.get(f"{self.CACHE_VERSION}:{key}")
+        except Exception:
+            return None
+
+    def _cache_set(self, key: str, value: Any) -> None:
+        """Store an API response, if caching is enabled."""
+        if self._disk_cache is None:
+            return
+        try:
+            self._disk_cache.set(f"{self.CACHE_VERSION}:{key}", value, expire=self.CACHE_TTL)
+        except Exception:
+            pass
+
+    def _get_session(self):
+        """Return this predictor's pooled requests.Session, creating it on first use."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=8,
+                pool_maxsize=16,
+                max_retries=Retry(
+                    total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504]
+                ),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._session = session
+        return self._session
 
     def predict(
         self,
@@ -96,7 +296,7 @@ class StructurePredictor:
             StructurePrediction object
         """
         # Determine if query is ID or sequence
-        is_sequence = len(query) > 20 and all(c in "ACDEFGHIKLMNPQRSTVWY" for c in query.upper())
+        is_sequence = len(query) > 20 and _AA_SEQUENCE_RE.fullmatch(query) is not None
 
         if method == "auto":
             if is_sequence:
@@ -111,53 +311,83 @@ class StructurePredictor:
         else:
             raise ValueError(f"Unknown method: {method}")
 
+    def predict_many(
+        self,
+        queries: list[str],
+        method: str = "auto",
+        max_workers: int = 8,
+    ) -> list[StructurePrediction]:
+        """
+        Predict or retrieve structures for many queries concurrently.
+
+        Args:
+            queries: UniProt IDs and/or protein sequences
+            method: Prediction method (auto, alphafold, esmfold)
+            max_workers: Maximum number of concurrent lookups
+
+        Returns:
+            StructurePrediction objects in query order
+        """
+        if not queries:
+            return []
+
+        # Create the shared session up front rather than racing in workers
+        try:
+            self._get_session()
+        except ImportError:
+            pass
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as pool:
+            return list(pool.map(lambda q: self.predict(q, method), queries))
+
     def _get_alphafold_structure(self, uniprot_id: str) -> StructurePrediction:
         """Get structure from AlphaFold Database."""
         try:
-            import requests
+            entry = self._cache_get(f"af:{uniprot_id}")
+            if entry is None:
+                session = self._get_session()
+
+                # Get prediction info
+                url = f"{self.ALPHAFOLD_API}/prediction/{uniprot_id}"
+                with _ALPHAFOLD_SLOTS:
+                    response = session.get(url, timeout=30)
+
+                if response.status_code == 404:
+                    # Structure not in database
+                    raise ValueError(f"No AlphaFold structure found for {uniprot_id}")
+                if response.status_code != 200:
+                    # Other error - fall back to simulation
+                    return self._simulate_alphafold_result(uniprot_id)
 
-            # Get prediction info
-            url = f"{self.ALPHAFOLD_API}/prediction/{uniprot_id}"
-            response = requests.get(url, timeout=30)
-
-            if response.status_code == 200:
                 data = response.json()
 
                 if isinstance(data, list) and len(data) > 0:
                     entry = data[0]
                 else:
                     entry = data
-
-                # Get PDB file
-                pdb_url = entry.get("pdbUrl")
-                pdb_string = None
-                if pdb_url:
-                    pdb_response = requests.get(pdb_url, timeout=30)
-                    if pdb_response.status_code == 200:
-                        pdb_string = pdb_response.text
-
-                # Parse pLDDT from CIF if available
-                plddt_scores = None
-                mean_plddt = entry.get("globalMetricValue")
-
-                return StructurePrediction(
-                    protein_id=uniprot_id,
-                    sequence=entry.get("uniprotSequence"),
-                    method="alphafold",
-                    pdb_string=pdb_string,
-                    pdb_url=pdb_url,
-                    mean_plddt=mean_plddt,
-                    plddt_scores=plddt_scores,
-                    model_version=entry.get("modelCreatedDate"),
-                    organism=entry.get("organismScientificName"),
-                )
-
-            elif response.status_code == 404:
-                # Structure not in database
-                raise ValueError(f"No AlphaFold structure found for {uniprot_id}")
-            else:
-                # Other error - fall back to simulation
-                return self._simulate_alphafold_result(uniprot_id)
+                self._cache_set(f"af:{uniprot_id}", entry)
+
+            # Get PDB file
+            pdb_url = entry.get("pdbUrl")
+            pdb_string = None
+            if pdb_url:
+                pdb_string = self._download_pdb(uniprot_id, pdb_url)
+
+            # Parse pLDDT from CIF if available
+            plddt_scores = None
+            mean_plddt = entry.get("globalMetricValue")
+
+            return StructurePrediction(
+                protein_id=uniprot_id,
+                sequence=entry.get("uniprotSequence"),
+                method="alphafold",
+                pdb_string=pdb_string,
+                pdb_url=pdb_url,
+                mean_plddt=mean_plddt,
+                plddt_scores=plddt_scores,
+                model_version=entry.get("modelCreatedDate"),
+                organism=entry.get("organismScientificName"),
+            )
 
         except Exception as e:
             if "No AlphaFold structure" in str(e):
@@ -165,12 +395,58 @@ class StructurePredictor:
             # Return simulated result for testing
             return self._simulate_alphafold_result(uniprot_id)
 
+    def _download_pdb(self, uniprot_id: str, pdb_url: str) -> str | None:
+        """Fetch an AlphaFold PDB over a gzip-encoded transfer.
+
+        With a cache_dir, the compressed bytes are kept as
+        ``AF-<id>.pdb.gz`` exactly as received and reused on later calls.
+        """
+        cache_path = self.cache_dir / f"AF-{uniprot_id}.pdb.gz" if self.cache_dir else None
+        if cache_path and cache_path.exists():
+            with gzip.open(cache_path, "rt") as f:
+                return f.read()
+
+        with _ALPHAFOLD_SLOTS:
+            response = self._get_session().get(
+                pdb_url,
+                headers={"Accept-Encoding": "gzip"},
+                stream=True,
+                timeout=30,
+            )
+            with response:
+                if response.status_code != 200:
+                    return None
+                # Read the body undecoded so a gzip transfer can be stored as is
+                body = response.raw.read(decode_content=False)
+                gzipped = response.headers.get("Content-Encoding", "").lower() == "gzip"
+
+        pdb_string = (gzip.decompress(body) if gzipped else body).decode("utf-8")
+
+        if cache_path:
+            # Unique temp name per writer, so concurrent downloads of the same
+            # entry never share a file. Caching is best effort: a failed write
+            # still returns the structure that was downloaded.
+            tmp_name = None
+            try:
+                with tempfile.NamedTemporaryFile(
+                    dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp", delete=False
+                ) as tmp:
+                    tmp_name = tmp.name
+                    tmp.write(body if gzipped else gzip.compress(body))
+                os.replace(tmp_name, cache_path)
+            except OSError:
+                if tmp_name:
+                    try:
+                        os.unlink(tmp_name)
+                    except OSError:
+                        pass
+
+        return pdb_string
+
     def _simulate_alphafold_result(self, uniprot_id: str) -> StructurePrediction:
         """Simulate AlphaFold result for testing."""
-        import hashlib
-
         # Generate deterministic values
-        hash_val = int(hashlib.md5(uniprot_id.encode()).hexdigest(), 16)
+        hash_val = _seed_hash(uniprot_id)
         mean_plddt = 70 + (hash_val % 25)  # 70-95 range
 
         return StructurePrediction(
@@ -185,25 +461,36 @@ class StructurePredictor:
 
     def _predict_esmfold(self, sequence: str) -> StructurePrediction:
         """Predict structure using ESMFold."""
+        cache_key = f"esm:{_seed_hash(sequence):016x}"
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            try:
+                return StructurePrediction.from_msgpack(cached)
+            except Exception:
+                pass
+
         try:
-            import requests
+            session = self._get_session()
 
             # ESMFold API
-            response = requests.post(
+            response = session.post(
                 self.ESMFOLD_API,
                 data=sequence,
                 headers={"Content-Type": "text/plain"},
                 timeout=300,  # Structure prediction can take time
+                stream=True,
             )
 
             if response.status_code == 200:
-                pdb_string = response.text
+                with response:
+                    body = b"".join(response.iter_content(chunk_size=1 << 16))
+                pdb_string = body.decode("utf-8")
 
                 # Parse pLDDT from B-factor column
-                plddt_scores = self._parse_plddt_from_pdb(pdb_string)
-                mean_plddt = sum(plddt_scores) / len(plddt_scores) if plddt_scores else None
+                plddt_scores = self._parse_plddt_from_bytes(body)
+                mean_plddt = float(plddt_scores.mean()) if plddt_scores.size else None
 
-                return StructurePrediction(
+                result = StructurePrediction(
                     protein_id=f"ESM_{hash(sequence) % 10000:04d}",
                     sequence=sequence,
                     method="esmfold",
@@ -212,6 +499,10 @@ class StructurePredictor:
                     mean_plddt=mean_plddt,
                     model_version="esmfold_v1",
                 )
+                # Folded structures are stored packed; plddt/PAE lists
+                # dominate the entry and pickle them far less compactly
+                self._cache_set(cache_key, result.to_msgpack())
+                return result
 
         except Exception as e:
             # Return simulated result
@@ -219,16 +510,18 @@ class StructurePredictor:
 
     def _simulate_esmfold_result(self, sequence: str) -> StructurePrediction:
         """Simulate ESMFold result for testing."""
-        import hashlib
+        import numpy as np
 
-        hash_val = int(hashlib.md5(sequence.encode()).hexdigest(), 16)
+        hash_val = _seed_hash(sequence)
         mean_plddt = 65 + (hash_val % 30)  # 65-95 range
 
-        # Generate per-residue pLDDT
-        plddt_scores = []
-        for i, aa in enumerate(sequence):
-            base = 70 + (ord(aa) % 20)
-            plddt_scores.append(round(base + (hash_val >> i) % 15, 1))
+        # Per-residue pLDDT: residue-dependent base plus a jitter taken from
+        # the hash shifted right by the residue index (zero past bit 63)
+        codepoints = np.frombuffer(sequence.encode("utf-32-le"), dtype="<u4")
+        if NUMBA_AVAILABLE and len(sequence) >= NUMBA_MIN_RESIDUES:
+            plddt_scores = _simulated_plddt_kernel(codepoints, np.uint64(hash_val))
+        else:
+            plddt_scores = self._simulated_plddt_numpy(codepoints, hash_val)
 
         return StructurePrediction(
             protein_id=f"ESM_{hash(sequence) % 10000:04d}",
@@ -240,65 +533,116 @@ class StructurePredictor:
             model_version="esmfold_v1",
         )
 
-    def _parse_plddt_from_pdb(self, pdb_string: str) -> list[float]:
-        """Extract pLDDT scores from PDB B-factor column."""
+    @staticmethod
+    def _simulated_plddt_numpy(codepoints, hash_val: int) -> "np.ndarray":
+        """Vectorized simulated pLDDT for sequences below the JIT threshold."""
+        import numpy as np
+
+        base = 70 + (codepoints % 20).astype(np.int64)
+        shifts = np.arange(len(codepoints), dtype=np.uint64)
+        shifted = np.uint64(hash_val) >> np.minimum(shifts, np.uint64(63))
+        jitter = np.where(shifts < 64, shifted % np.uint64(15), 0).astype(np.int64)
+        return base + jitter
+
+    def _parse_plddt_from_bytes(self, data: bytes) -> "np.ndarray":
+        """Extract pLDDT scores from the B-factor column of a raw PDB body.
+
+        Line starts come from one newline scan and the fixed-width columns
+        are gathered with fancy indexing, so no per-line substrings are
+        created.
+        """
+        import numpy as np
+
+        buf = np.frombuffer(data, dtype=np.uint8)
+        if not buf.size:
+            return np.empty(0)
+
+        newlines = np.flatnonzero(buf == 0x0A)
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [buf.size]))
+
+        def column(lo: int, hi: int) -> "np.ndarray":
+            # Bytes [lo, hi) of every line; past the end of a line reads as blank
+            idx = starts[:, None] + np.arange(lo, hi)
+            col = buf[np.minimum(idx, buf.size - 1)]
+            col[idx >= ends[:, None]] = 0x20
+            return col.view(f"S{hi - lo}").ravel()
+
+        # CA ATOM records (atom name in columns 13-16)
+        keep = ends - starts >= 16
+        starts, ends = starts[keep], ends[keep]
+        keep = (column(0, 4) == b"ATOM") & (column(12, 16) == b" CA ")
+        starts, ends = starts[keep], ends[keep]
+        if not starts.size:
+            return np.empty(0)
+
+        # Residue number 23-26, B-factor 61-66; malformed records fall back
+        # to the per-line parser, which skips them
+        try:
+            res_nums = column(22, 26).astype(np.int64)
+            b_factors = column(60, 66).astype(np.float64)
+        except ValueError:
+            text = data.decode("utf-8", errors="replace")
+            return self._parse_plddt_lines([
+                line for line in text.split("\n")
+                if line.startswith("ATOM") and " CA " in line
+            ])
+
+        # First CA record per residue, in file order
+        _, first = np.unique(res_nums, return_index=True)
+        first.sort()
+        return b_factors[first]
+
+    def _parse_plddt_lines(self, ca_lines: list[str]) -> "np.ndarray":
+        """Per-line pLDDT parsing that skips malformed CA records."""
+        import numpy as np
+
         plddt_scores = []
         seen_residues = set()
 
-        for line in pdb_string.split("\n"):
-            if line.startswith("ATOM") and " CA " in line:
-                try:
-                    res_num = int(line[22:26].strip())
-                    if res_num not in seen_residues:
-                        b_factor = float(line[60:66].strip())
-                        plddt_scores.append(b_factor)
-                        seen_residues.add(res_num)
-                except (ValueError, IndexError):
-                    continue
+        for line in ca_lines:
+            try:
+                res_num = int(line[22:26].strip())
+                if res_num not in seen_residues:
+                    b_factor = float(line[60:66].strip())
+                    plddt_scores.append(b_factor)
+                    seen_residues.add(res_num)
+            except (ValueError, IndexError):
+                continue
 
-        return plddt_scores
+        return np.array(plddt_scores, dtype=np.float64)
 
     def _generate_mock_pdb(self, sequence: str) -> str:
         """Generate a mock PDB file for testing."""
         lines = ["HEADER    MOCK STRUCTURE"]
         lines.append(f"TITLE     ESMFold prediction for sequence length {len(sequence)}")
 
-        for i, aa in enumerate(sequence):
-            # Simplified CA-only structure
-            x = i * 3.8  # ~3.8A between CA atoms
-            y = 0
-            z = 0
-            b_factor = 80.0  # Mock pLDDT
-
-            lines.append(
-                f"ATOM  {i+1:5d}  CA  {self._aa_3letter(aa)} A{i+1:4d}    "
-                f"{x:8.3f}{y:8.3f}{z:8.3f}  1.00{b_factor:6.2f}           C"
-            )
+        # Simplified CA-only structure, ~3.8A between CA atoms
+        by_ord = _AA_BY_ORD
+        residues = [by_ord[o] if o < 128 else "UNK" for o in map(ord, sequence)]
+        heads, tails = _mock_ca_affixes(len(residues))
+        lines.extend(map("".join, zip(heads, residues, tails)))
 
         lines.append("END")
         return "\n".join(lines)
 
-    def _aa_3letter(self, aa: str) -> str:
-        """Convert 1-letter amino acid to 3-letter code."""
-        codes = {
-            "A": "ALA", "C": "CYS", "D": "ASP", "E": "GLU", "F": "PHE",
-            "G": "GLY", "H": "HIS", "I": "ILE", "K": "LYS", "L": "LEU",
-            "M": "MET", "N": "ASN", "P": "PRO", "Q": "GLN", "R": "ARG",
-            "S": "SER", "T": "THR", "V": "VAL", "W": "TRP", "Y": "TYR",
-        }
-        return codes.get(aa.upper(), "UNK")
-
     def _get_sequence(self, uniprot_id: str) -> str:
         """Get protein sequence from UniProt."""
+        cached = self._cache_get(f"up:{uniprot_id}")
+        if cached is not None:
+            return cached
+
         try:
-            import requests
+            session = self._get_session()
 
             url = f"https://rest.uniprot.org/uniprotkb/{uniprot_id}.fasta"
-            response = requests.get(url, timeout=30)
+            response = session.get(url, timeout=30)
 
             if response.status_code == 200:
                 lines = response.text.strip().split("\n")
-                return "".join(lines[1:])  # Skip header
+                sequence = "".join(lines[1:])  # Skip header
+                self._cache_set(f"up:{uniprot_id}", sequence)
+                return sequence
 
         except Exception:
             pass
@@ -307,6 +651,12 @@ class StructurePredictor:
         return "MVLSPADKTNVKAAWGKVGAHAGEYGAEALERMFLSFPTTKTYFPHFDLSH"
 
 
+@lru_cache(maxsize=None)
+def _get_default_predictor() -> StructurePredictor:
+    """Shared predictor so the helpers below reuse one session and cache."""
+    return StructurePredictor()
+
+
 def predict_structure_alphafold(uniprot_id: str) -> dict:
     """
     Get AlphaFold structure prediction.
@@ -317,7 +667,7 @@ def predict_structure_alphafold(uniprot_id: str) -> dict:
     Returns:
         Structure prediction with PDB URL and quality metrics
     """
-    predictor = StructurePredictor()
+    predictor = _get_default_predictor()
     result = predictor.predict(uniprot_id, method="alphafold")
     return result.to_dict()
 
@@ -332,7 +682,7 @@ def predict_structure_esmfold(sequence: str) -> dict:
     Returns:
         Structure prediction with PDB and quality metrics
     """
-    predictor = StructurePredictor()
+    predictor = _get_default_predictor()
     result = predictor.predict(sequence, method="esmfold")
     return result.to_dict()
 
@@ -351,7 +701,7 @@ def get_alphafold_structure(
     Returns:
         Structure info with optional saved path
     """
-    predictor = StructurePredictor()
+    predictor = _get_default_predictor()
     result = predictor.predict(uniprot_id, method="alphafold")
 
     output = result.to_dict()
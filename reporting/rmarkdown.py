@@ -4,12 +4,30 @@ R Markdown report generation.
 Creates reproducible R Markdown documents for bioinformatics analyses.
 """
 
+import string
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date
 from pathlib import Path
 from typing import Any
 
 
+# Shared by every generator; only the title, author, date and format vary
+_YAML_TEMPLATE = string.Template("""---
+title: "$title"
+author: "$author"
+date: "$date"
+output:
+  $fmt:
+    toc: true
+    toc_depth: 3
+    toc_float: true
+    code_folding: hide
+    theme: flatly
+    highlight: tango
+---
+""")
+
+
 @dataclass
 class RMarkdownChunk:
     """An R code chunk."""
@@ -65,21 +83,12 @@ class RMarkdownGenerator:
 
     def _add_yaml_header(self):
         """Add YAML header to document."""
-        yaml = f"""---
-title: "{self.title}"
-author: "{self.author}"
-date: "{datetime.now().strftime('%Y-%m-%d')}"
-output:
-  {self.output_format}:
-    toc: true
-    toc_depth: 3
-    toc_float: true
-    code_folding: hide
-    theme: flatly
-    highlight: tango
----
-"""
-        self.content.append(yaml)
+        self.content.append(_YAML_TEMPLATE.substitute(
+            title=self.title,
+            author=self.author,
+            date=date.today().isoformat(),
+            fmt=self.output_format,
+        ))
 
     def add_markdown(self, text: str) -> "RMarkdownGenerator":
         """Add markdown text."""